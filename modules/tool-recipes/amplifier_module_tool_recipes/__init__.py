@@ -1,6 +1,11 @@
 """Amplifier tool-recipes module - Execute multi-step AI agent recipes."""
 
+import asyncio
+import copy
+import functools
 import logging
+from collections.abc import Awaitable
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -10,12 +15,56 @@ from amplifier_core import ToolResult
 from .executor import ApprovalGatePausedError
 from .executor import RecipeExecutor
 from .models import Recipe
+from .models import load_recipe
 from .session import ApprovalStatus
 from .session import SessionManager
+from .session import dumps_json
+from .validator import ValidationResult
 from .validator import validate_recipe
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of validation results kept per tool instance
+_VALIDATION_CACHE_SIZE = 128
+
+# Completed contexts larger than this are written to the session directory instead of returned inline
+DEFAULT_MAX_INLINE_CONTEXT_BYTES = 64 * 1024
+
+
+@functools.lru_cache(maxsize=512)
+def _as_path(path_str: str, project_path: Path) -> Path:
+    """Convert a user-supplied recipe path to an absolute Path (relative to project_path).
+
+    Cached per (string, project path) so repeated calls reuse the same Path object.
+    Symlinks are deliberately not resolved so sub-recipe lookup stays relative to the
+    path the user gave.
+    """
+    path = Path(path_str).expanduser()
+    return path if path.is_absolute() else project_path / path
+
+
+def _missing_arg_result(field: str, operation: str) -> ToolResult:
+    """Error result for a missing required input field.
+
+    Built fresh on each call: ToolResult is a mutable model, so instances are not shared.
+    """
+    return ToolResult(success=False, error={"message": f"{field} is required for {operation} operation"})
+
+
+def _paused_result(e: ApprovalGatePausedError, recipe_name: str) -> ToolResult:
+    """Result for a recipe that paused at an approval gate (success, not an error)."""
+    return ToolResult(
+        success=True,
+        output={
+            "status": "paused_for_approval",
+            "recipe": recipe_name,
+            "session_id": e.session_id,
+            "stage_name": e.stage_name,
+            "approval_prompt": e.approval_prompt,
+            "message": f"Recipe paused at stage '{e.stage_name}'. Use 'approve' or 'deny' to continue.",
+        },
+    )
+
 
 async def mount(coordinator: ModuleCoordinator, config: dict[str, Any] | None = None):
     """
@@ -33,7 +82,12 @@ async def mount(coordinator: ModuleCoordinator, config: dict[str, Any] | None =
     session_manager = SessionManager(base_dir, auto_cleanup_days)
 
     # Initialize executor
-    executor = RecipeExecutor(coordinator, session_manager)
+    executor = RecipeExecutor(
+        coordinator,
+        session_manager,
+        checkpoint_interval=config.get("checkpoint_interval", 8),
+        checkpoint_max_seconds=config.get("checkpoint_max_seconds", 1.0),
+    )
 
     # Create tool instance
     tool = RecipesTool(executor, session_manager, coordinator, config)
@@ -44,29 +98,57 @@ async def mount(coordinator: ModuleCoordinator, config: dict[str, Any] | None =
     logger.info("Mounted tool-recipes")
 
 
+_INPUT_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "operation": {
+            "type": "string",
+            "enum": ["execute", "resume", "list", "validate", "approvals", "approve", "approve_batch", "deny"],
+            "description": "Operation to perform",
+        },
+        "recipe_path": {
+            "type": "string",
+            "description": "Path to recipe YAML file (required for 'execute' and 'validate' operations)",
+        },
+        "context": {
+            "type": "object",
+            "description": "Context variables for recipe execution (for 'execute' operation)",
+        },
+        "session_id": {
+            "type": "string",
+            "description": "Session ID (required for 'resume', 'approve', 'deny' operations)",
+        },
+        "stage_name": {
+            "type": "string",
+            "description": "Stage name to approve or deny (required for 'approve' and 'deny' operations)",
+        },
+        "reason": {
+            "type": "string",
+            "description": "Reason for denial (optional for 'deny' operation)",
+        },
+        "approvals": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "session_id": {"type": "string"},
+                    "stage_name": {"type": "string"},
+                },
+                "required": ["session_id", "stage_name"],
+            },
+            "description": "Stages to approve (required for 'approve_batch' operation)",
+        },
+    },
+    "required": ["operation"],
+}
+
+
 class RecipesTool:
     """Tool for executing, resuming, and managing recipe workflows."""
 
-    def __init__(
-        self,
-        executor: RecipeExecutor,
-        session_manager: SessionManager,
-        coordinator: ModuleCoordinator,
-        config: dict[str, Any],
-    ):
-        """Initialize tool."""
-        self.executor = executor
-        self.session_manager = session_manager
-        self.coordinator = coordinator
-        self.config = config
-
-    @property
-    def name(self) -> str:
-        return "recipes"
+    name = "recipes"
 
-    @property
-    def description(self) -> str:
-        return """Execute multi-step AI agent recipes (workflows).
+    description = """Execute multi-step AI agent recipes (workflows).
 
 Recipes are declarative YAML specifications that define multi-step agent workflows with:
 - Sequential execution with state persistence
@@ -82,6 +164,7 @@ Operations:
 - validate: Validate recipe structure
 - approvals: List pending approvals across sessions
 - approve: Approve a stage to continue execution
+- approve_batch: Approve several stages (across sessions) in one call
 - deny: Deny a stage to stop execution
 
 Example:
@@ -91,40 +174,98 @@ Example:
   Validate recipe: {{"operation": "validate", "recipe_path": "my-recipe.yaml"}}
   List approvals: {{"operation": "approvals"}}
   Approve stage: {{"operation": "approve", "session_id": "...", "stage_name": "planning"}}
+  Approve batch: {{"operation": "approve_batch",
+                  "approvals": [{{"session_id": "...", "stage_name": "planning"}}]}}
   Deny stage: {{"operation": "deny", "session_id": "...", "stage_name": "planning", "reason": "needs revision"}}"""
 
     @property
-    def input_schema(self) -> dict:
+    def input_schema(self) -> dict[str, Any]:
+        """JSON schema for tool input; a fresh copy so callers cannot alter the shared schema."""
+        return copy.deepcopy(_INPUT_SCHEMA)
+
+    # Operation name -> handler, populated after the class body
+    _OPERATIONS: dict[str, Callable[["RecipesTool", dict[str, Any], Path], Awaitable[ToolResult]]]
+
+    def __init__(
+        self,
+        executor: RecipeExecutor,
+        session_manager: SessionManager,
+        coordinator: ModuleCoordinator,
+        config: dict[str, Any],
+    ):
+        """Initialize tool."""
+        self.executor = executor
+        self.session_manager = session_manager
+        self.coordinator = coordinator
+        self.config = config
+        # id(recipe) -> (recipe, agents signature, result); recipe kept to verify identity
+        self._validation_cache: dict[int, tuple[Recipe, Any, ValidationResult]] = {}
+
+    async def _load_validated(self, recipe_path: Path) -> tuple[Recipe, ValidationResult]:
+        """Load recipe and its validation result, reusing both when the file is unchanged.
+
+        Only the file read and YAML parse run in a worker thread. Validation calls the
+        coordinator and updates the validation cache, so it stays on the event loop.
+        """
+        recipe = await asyncio.to_thread(load_recipe, recipe_path)
+        return recipe, self._validate_cached(recipe)
+
+    def _validate_cached(self, recipe: Recipe) -> ValidationResult:
+        """Validate recipe, reusing the previous result for the same recipe object.
+
+        Relies on the recipe parse cache keeping recipe identity stable across calls.
+        The result is recomputed if the coordinator's available agents change.
+        """
+        signature = self._agents_signature()
+        cached = self._validation_cache.get(id(recipe))
+        if cached is not None and cached[0] is recipe and cached[1] == signature:
+            return cached[2]
+
+        result = validate_recipe(recipe, self.coordinator)
+
+        if len(self._validation_cache) >= _VALIDATION_CACHE_SIZE:
+            # Evict oldest entry (dicts preserve insertion order)
+            self._validation_cache.pop(next(iter(self._validation_cache)), None)
+        self._validation_cache[id(recipe)] = (recipe, signature, result)
+        return result
+
+    def _agents_signature(self) -> Any:
+        """Snapshot of coordinator agent availability (the only coordinator input to validation)."""
+        try:
+            available_agents = getattr(self.coordinator, "available_agents", None)
+            if callable(available_agents):
+                available_agents = available_agents()
+            if isinstance(available_agents, list | set | dict):
+                return frozenset(available_agents)
+        except Exception:
+            # Availability check is best-effort (see check_agent_availability)
+            pass
+        return None
+
+    def _context_output(self, context: dict[str, Any], session_id: str, project_path: Path) -> dict[str, Any]:
+        """Build the context part of a completed result.
+
+        Small contexts are returned inline. Contexts larger than max_inline_context_bytes
+        are written to the session directory and returned as a file reference plus summary.
+        The recipe has already completed, so if the spill fails the context is returned
+        inline with a warning rather than failing the result.
+        """
+        max_inline = self.config.get("max_inline_context_bytes", DEFAULT_MAX_INLINE_CONTEXT_BYTES)
+        try:
+            serialized = dumps_json(context)
+            if len(serialized) <= max_inline:
+                return {"context": context}
+            context_file = self.session_manager.save_context(session_id, project_path, serialized)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write context.json for session {session_id}, returning it inline: {e}")
+            return {"context": context, "context_warning": f"Context returned inline: {e}"}
+
         return {
-            "type": "object",
-            "properties": {
-                "operation": {
-                    "type": "string",
-                    "enum": ["execute", "resume", "list", "validate", "approvals", "approve", "deny"],
-                    "description": "Operation to perform",
-                },
-                "recipe_path": {
-                    "type": "string",
-                    "description": "Path to recipe YAML file (required for 'execute' and 'validate' operations)",
-                },
-                "context": {
-                    "type": "object",
-                    "description": "Context variables for recipe execution (for 'execute' operation)",
-                },
-                "session_id": {
-                    "type": "string",
-                    "description": "Session ID (required for 'resume', 'approve', 'deny' operations)",
-                },
-                "stage_name": {
-                    "type": "string",
-                    "description": "Stage name to approve or deny (required for 'approve' and 'deny' operations)",
-                },
-                "reason": {
-                    "type": "string",
-                    "description": "Reason for denial (optional for 'deny' operation)",
-                },
+            "context_ref": str(context_file),
+            "context_summary": {
+                "keys": sorted(context.keys()),
+                "size_bytes": len(serialized),
             },
-            "required": ["operation"],
         }
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
@@ -139,52 +280,47 @@ Example:
         """
         operation = input.get("operation")
 
-        try:
-            if operation == "execute":
-                return await self._execute_recipe(input)
-            if operation == "resume":
-                return await self._resume_recipe(input)
-            if operation == "list":
-                return await self._list_sessions(input)
-            if operation == "validate":
-                return await self._validate_recipe(input)
-            if operation == "approvals":
-                return await self._list_approvals(input)
-            if operation == "approve":
-                return await self._approve_stage(input)
-            if operation == "deny":
-                return await self._deny_stage(input)
+        handler = self._OPERATIONS.get(operation) if isinstance(operation, str) else None
+        if handler is None:
             return ToolResult(
                 success=False,
                 error={"message": f"Unknown operation: {operation}"},
             )
+
+        try:
+            # Project path is the current working directory, resolved once per call
+            project_path = Path.cwd()
+            return await handler(self, input, project_path)
+        except (FileNotFoundError, ValueError) as e:
+            # Expected user-facing errors (missing files, invalid input) - no traceback needed
+            err_type = e.__class__.__name__
+            logger.warning(f"Recipe tool error ({err_type}): {e}")
+            return ToolResult(
+                success=False,
+                error={"message": str(e), "type": err_type},
+            )
         except Exception as e:
-            logger.error(f"Recipe tool error: {e}", exc_info=True)
+            logger.exception(f"Recipe tool error: {e}")
             return ToolResult(
                 success=False,
-                error={"message": str(e), "type": type(e).__name__},
+                error={"message": str(e), "type": e.__class__.__name__},
             )
 
-    async def _execute_recipe(self, input: dict[str, Any]) -> ToolResult:
+    async def _execute_recipe(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """Execute recipe from YAML file."""
         recipe_path_str = input.get("recipe_path")
         if not recipe_path_str:
-            return ToolResult(success=False, error={"message": "recipe_path is required for execute operation"})
+            return _missing_arg_result("recipe_path", "execute")
 
-        recipe_path = Path(recipe_path_str)
+        recipe_path = _as_path(recipe_path_str, project_path)
         context_vars = input.get("context", {})
 
-        # Determine project path (current working directory)
-        project_path = Path.cwd()
-
-        # Load recipe
+        # Load (parsed off the event loop) and validate recipe, cached while the file is unchanged
         try:
-            recipe = Recipe.from_yaml(recipe_path)
+            recipe, validation = await self._load_validated(recipe_path)
         except Exception as e:
             return ToolResult(success=False, error={"message": f"Failed to load recipe: {str(e)}"})
 
-        # Validate recipe
-        validation = validate_recipe(recipe, self.coordinator)
         if not validation.is_valid:
             return ToolResult(
                 success=False,
@@ -200,29 +336,20 @@ Example:
             final_context = await self.executor.execute_recipe(
                 recipe, context_vars, project_path, recipe_path=recipe_path
             )
+            session_id = final_context["session"]["id"]
 
             return ToolResult(
                 success=True,
                 output={
                     "status": "completed",
                     "recipe": recipe.name,
-                    "session_id": final_context["session"]["id"],
-                    "context": final_context,
+                    "session_id": session_id,
+                    **self._context_output(final_context, session_id, project_path),
                 },
             )
         except ApprovalGatePausedError as e:
             # Recipe paused at approval gate - not an error
-            return ToolResult(
-                success=True,
-                output={
-                    "status": "paused_for_approval",
-                    "recipe": recipe.name,
-                    "session_id": e.session_id,
-                    "stage_name": e.stage_name,
-                    "approval_prompt": e.approval_prompt,
-                    "message": f"Recipe paused at stage '{e.stage_name}'. Use 'approve' or 'deny' to continue.",
-                },
-            )
+            return _paused_result(e, recipe.name)
         except Exception as e:
             return ToolResult(
                 success=False,
@@ -232,13 +359,11 @@ Example:
                 },
             )
 
-    async def _resume_recipe(self, input: dict[str, Any]) -> ToolResult:
+    async def _resume_recipe(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """Resume interrupted recipe session."""
         session_id = input.get("session_id")
         if not session_id:
-            return ToolResult(success=False, error={"message": "session_id is required for resume operation"})
-
-        project_path = Path.cwd()
+            return _missing_arg_result("session_id", "resume")
 
         # Check session exists
         if not self.session_manager.session_exists(session_id, project_path):
@@ -264,7 +389,7 @@ Example:
             )
 
         try:
-            recipe = Recipe.from_yaml(recipe_file)
+            recipe = await asyncio.to_thread(load_recipe, recipe_file)
         except Exception as e:
             return ToolResult(success=False, error={"message": f"Failed to load recipe from session: {str(e)}"})
 
@@ -280,22 +405,12 @@ Example:
                     "status": "completed",
                     "recipe": recipe.name,
                     "session_id": session_id,
-                    "context": final_context,
+                    **self._context_output(final_context, session_id, project_path),
                 },
             )
         except ApprovalGatePausedError as e:
             # Recipe paused at another approval gate
-            return ToolResult(
-                success=True,
-                output={
-                    "status": "paused_for_approval",
-                    "recipe": recipe.name,
-                    "session_id": e.session_id,
-                    "stage_name": e.stage_name,
-                    "approval_prompt": e.approval_prompt,
-                    "message": f"Recipe paused at stage '{e.stage_name}'. Use 'approve' or 'deny' to continue.",
-                },
-            )
+            return _paused_result(e, recipe.name)
         except Exception as e:
             return ToolResult(
                 success=False,
@@ -305,10 +420,8 @@ Example:
                 },
             )
 
-    async def _list_sessions(self, input: dict[str, Any]) -> ToolResult:
+    async def _list_sessions(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """List active recipe sessions."""
-        project_path = Path.cwd()
-
         try:
             sessions = self.session_manager.list_sessions(project_path)
 
@@ -325,20 +438,17 @@ Example:
                 error={"message": f"Failed to list sessions: {str(e)}"},
             )
 
-    async def _validate_recipe(self, input: dict[str, Any]) -> ToolResult:
+    async def _validate_recipe(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """Validate recipe without executing."""
         recipe_path_str = input.get("recipe_path")
         if not recipe_path_str:
-            return ToolResult(success=False, error={"message": "recipe_path is required for validate operation"})
+            return _missing_arg_result("recipe_path", "validate")
 
-        recipe_path = Path(recipe_path_str)
+        recipe_path = _as_path(recipe_path_str, project_path)
 
         try:
-            # Load recipe
-            recipe = Recipe.from_yaml(recipe_path)
-
-            # Validate
-            validation = validate_recipe(recipe, self.coordinator)
+            # Load and validate (both served from cache after a prior execute/validate)
+            recipe, validation = await self._load_validated(recipe_path)
 
             if validation.is_valid:
                 return ToolResult(
@@ -365,10 +475,8 @@ Example:
                 error={"message": f"Failed to validate recipe: {str(e)}"},
             )
 
-    async def _list_approvals(self, input: dict[str, Any]) -> ToolResult:
+    async def _list_approvals(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """List pending approvals across all sessions."""
-        project_path = Path.cwd()
-
         try:
             pending_approvals = self.session_manager.list_pending_approvals(project_path)
 
@@ -385,27 +493,26 @@ Example:
                 error={"message": f"Failed to list approvals: {str(e)}"},
             )
 
-    async def _approve_stage(self, input: dict[str, Any]) -> ToolResult:
+    async def _approve_stage(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """Approve a stage to continue execution."""
         session_id = input.get("session_id")
         stage_name = input.get("stage_name")
 
         if not session_id:
-            return ToolResult(success=False, error={"message": "session_id is required for approve operation"})
+            return _missing_arg_result("session_id", "approve")
         if not stage_name:
-            return ToolResult(success=False, error={"message": "stage_name is required for approve operation"})
-
-        project_path = Path.cwd()
+            return _missing_arg_result("stage_name", "approve")
 
-        # Verify session exists
-        if not self.session_manager.session_exists(session_id, project_path):
+        # Load session state and pending approval with a single read
+        try:
+            state, pending = self.session_manager.load_pending_approval(session_id, project_path)
+        except FileNotFoundError:
             return ToolResult(
                 success=False,
                 error={"message": f"Session not found: {session_id}"},
             )
 
         # Check if there's a pending approval for this stage
-        pending = self.session_manager.get_pending_approval(session_id, project_path)
         if not pending:
             return ToolResult(
                 success=False,
@@ -422,12 +529,11 @@ Example:
 
         try:
             # Set approval status
-            self.session_manager.set_stage_approval_status(
-                session_id=session_id,
-                project_path=project_path,
-                stage_name=stage_name,
-                status=ApprovalStatus.APPROVED,
-                reason="Approved by user",
+            self.session_manager.apply_stage_approvals(
+                session_id,
+                project_path,
+                state,
+                [(stage_name, ApprovalStatus.APPROVED, "Approved by user")],
             )
 
             return ToolResult(
@@ -445,28 +551,104 @@ Example:
                 error={"message": f"Failed to approve stage: {str(e)}"},
             )
 
-    async def _deny_stage(self, input: dict[str, Any]) -> ToolResult:
+    async def _approve_batch(self, input: dict[str, Any], project_path: Path) -> ToolResult:
+        """Approve several stages, writing each session's state once."""
+        approvals = input.get("approvals")
+        if not approvals or not isinstance(approvals, list):
+            return _missing_arg_result("approvals list", "approve_batch")
+
+        # Group requested stages by session, preserving request order
+        by_session: dict[str, list[str]] = {}
+        failed: list[dict[str, Any]] = []
+        for entry in approvals:
+            session_id = entry.get("session_id") if isinstance(entry, dict) else None
+            stage_name = entry.get("stage_name") if isinstance(entry, dict) else None
+            if not session_id or not stage_name:
+                failed.append({"entry": entry, "error": "session_id and stage_name are required"})
+                continue
+            by_session.setdefault(session_id, []).append(stage_name)
+
+        approved: list[dict[str, Any]] = []
+        for session_id, stage_names in by_session.items():
+            try:
+                state, pending = self.session_manager.load_pending_approval(session_id, project_path)
+            except FileNotFoundError:
+                failed.extend(
+                    {"session_id": session_id, "stage_name": name, "error": f"Session not found: {session_id}"}
+                    for name in stage_names
+                )
+                continue
+
+            to_approve: list[str] = []
+            for stage_name in stage_names:
+                if not pending:
+                    error = f"No pending approval for session: {session_id}"
+                elif pending["stage_name"] != stage_name:
+                    error = f"Stage mismatch: pending approval is for '{pending['stage_name']}', not '{stage_name}'"
+                else:
+                    to_approve.append(stage_name)
+                    continue
+                failed.append({"session_id": session_id, "stage_name": stage_name, "error": error})
+
+            if not to_approve:
+                continue
+
+            try:
+                # Single state write for all approvals in this session
+                self.session_manager.apply_stage_approvals(
+                    session_id,
+                    project_path,
+                    state,
+                    [(stage_name, ApprovalStatus.APPROVED, "Approved by user") for stage_name in to_approve],
+                )
+                approved.extend({"session_id": session_id, "stage_name": name} for name in to_approve)
+            except Exception as e:
+                failed.extend(
+                    {"session_id": session_id, "stage_name": name, "error": f"Failed to approve stage: {str(e)}"}
+                    for name in to_approve
+                )
+
+        if failed:
+            return ToolResult(
+                success=False,
+                error={
+                    "message": f"{len(failed)} approval(s) failed",
+                    "approved": approved,
+                    "failed": failed,
+                },
+            )
+
+        return ToolResult(
+            success=True,
+            output={
+                "status": "approved",
+                "approved": approved,
+                "count": len(approved),
+                "message": f"{len(approved)} stage(s) approved. Use 'resume' operation to continue execution.",
+            },
+        )
+
+    async def _deny_stage(self, input: dict[str, Any], project_path: Path) -> ToolResult:
         """Deny a stage to stop execution."""
         session_id = input.get("session_id")
         stage_name = input.get("stage_name")
         reason = input.get("reason", "Denied by user")
 
         if not session_id:
-            return ToolResult(success=False, error={"message": "session_id is required for deny operation"})
+            return _missing_arg_result("session_id", "deny")
         if not stage_name:
-            return ToolResult(success=False, error={"message": "stage_name is required for deny operation"})
+            return _missing_arg_result("stage_name", "deny")
 
-        project_path = Path.cwd()
-
-        # Verify session exists
-        if not self.session_manager.session_exists(session_id, project_path):
+        # Load session state and pending approval with a single read
+        try:
+            state, pending = self.session_manager.load_pending_approval(session_id, project_path)
+        except FileNotFoundError:
             return ToolResult(
                 success=False,
                 error={"message": f"Session not found: {session_id}"},
             )
 
         # Check if there's a pending approval for this stage
-        pending = self.session_manager.get_pending_approval(session_id, project_path)
         if not pending:
             return ToolResult(
                 success=False,
@@ -482,18 +664,15 @@ Example:
             )
 
         try:
-            # Set denial status
-            self.session_manager.set_stage_approval_status(
-                session_id=session_id,
-                project_path=project_path,
-                stage_name=stage_name,
-                status=ApprovalStatus.DENIED,
-                reason=reason,
+            # Set denial status and clear the pending approval in one write
+            self.session_manager.apply_stage_approvals(
+                session_id,
+                project_path,
+                state,
+                [(stage_name, ApprovalStatus.DENIED, reason)],
+                clear_pending=True,
             )
 
-            # Clear the pending approval
-            self.session_manager.clear_pending_approval(session_id, project_path)
-
             return ToolResult(
                 success=True,
                 output={
@@ -509,3 +688,15 @@ Example:
                 success=False,
                 error={"message": f"Failed to deny stage: {str(e)}"},
             )
+
+
+RecipesTool._OPERATIONS = {
+    "execute": RecipesTool._execute_recipe,
+    "resume": RecipesTool._resume_recipe,
+    "list": RecipesTool._list_sessions,
+    "validate": RecipesTool._validate_recipe,
+    "approvals": RecipesTool._list_approvals,
+    "approve": RecipesTool._approve_stage,
+    "approve_batch": RecipesTool._approve_batch,
+    "deny": RecipesTool._deny_stage,
+}
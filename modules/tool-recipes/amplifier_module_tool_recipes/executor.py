@@ -1,8 +1,15 @@
 """Recipe execution engine."""
 
 import asyncio
+import contextlib
+import copy
 import datetime
+import functools
+import logging
 import re
+import time
+from collections import ChainMap
+from collections.abc import Mapping
 from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
@@ -12,10 +19,13 @@ from .expression_evaluator import ExpressionError
 from .expression_evaluator import evaluate_condition
 from .models import Recipe
 from .models import RecursionConfig
+from .models import load_recipe
 from .models import Step
 from .session import ApprovalStatus
 from .session import SessionManager
 
+logger = logging.getLogger(__name__)
+
 
 class SkipRemainingError(Exception):
     """Raised when step fails with on_error='skip_remaining'."""
@@ -38,6 +48,27 @@ class ApprovalGatePausedError(Exception):
         super().__init__(f"Execution paused at stage '{stage_name}' awaiting approval")
 
 
+@dataclass(frozen=True)
+class RetryPlan:
+    """Retry settings resolved from a step's retry config."""
+
+    max_attempts: int = 1
+    backoff: str = "exponential"
+    initial_delay: float = 5
+    max_delay: float = 300
+
+    @classmethod
+    def from_step(cls, step: Step) -> "RetryPlan":
+        """Resolve retry settings for step, applying defaults for missing keys."""
+        retry_config = step.retry or {}
+        return cls(
+            max_attempts=retry_config.get("max_attempts", 1),
+            backoff=retry_config.get("backoff", "exponential"),
+            initial_delay=retry_config.get("initial_delay", 5),
+            max_delay=retry_config.get("max_delay", 300),
+        )
+
+
 @dataclass
 class RecursionState:
     """Track recursion across nested recipe executions."""
@@ -63,7 +94,11 @@ class RecursionState:
 
     def increment_steps(self) -> None:
         """Increment total steps counter and check limit."""
-        self.total_steps += 1
+        self.increment_steps_n(1)
+
+    def increment_steps_n(self, n: int) -> None:
+        """Count n steps at once (e.g. a whole foreach) and check limit."""
+        self.total_steps += n
         self.check_total_steps()
 
     def enter_recipe(self, recipe_name: str, override_config: RecursionConfig | None = None) -> "RecursionState":
@@ -87,19 +122,131 @@ class RecursionState:
         )
 
 
+_TEMPLATE_VARIABLE = re.compile(r"\{\{(\w+(?:\.\w+)?)\}\}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_template(template: str) -> tuple[tuple[str, str | None], ...]:
+    """Split a template into (literal, variable) segments, scanning it only once.
+
+    Prompts are static per step but substituted on every execution, retry and
+    foreach iteration, so the parsed form is cached by template text. The final
+    segment's variable is None when the template ends with literal text.
+    """
+    segments: list[tuple[str, str | None]] = []
+    pos = 0
+    for match in _TEMPLATE_VARIABLE.finditer(template):
+        segments.append((template[pos : match.start()], match.group(1)))
+        pos = match.end()
+    segments.append((template[pos:], None))
+    return tuple(segments)
+
+
+_FOREACH_VARIABLE = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
+
+
+@functools.lru_cache(maxsize=256)
+def _foreach_path(foreach: str) -> tuple[str, ...]:
+    """Parse a foreach reference like '{{outputs.files}}' into its path parts, once per string.
+
+    Raises:
+        ValueError: If foreach is not a single {{variable}} reference
+    """
+    match = _FOREACH_VARIABLE.match(foreach.strip())
+    if not match:
+        raise ValueError(f"Invalid foreach syntax: {foreach}")
+    return tuple(match.group(1).split("."))
+
+
+def _record_skipped(context: dict[str, Any], step_id: str) -> None:
+    """Add step_id to the context's skipped-steps list."""
+    context["_skipped_steps"] = [*context.get("_skipped_steps", ()), step_id]
+
+
+class CheckpointBatcher:
+    """Coalesce per-step session checkpoints into fewer state writes.
+
+    Only the most recent state is kept (last write wins). It is written once
+    max_batch checkpoints have accumulated, or after max_interval_s seconds via a
+    timer so a slow following step never leaves the on-disk state stale for long.
+    Callers must flush() before pausing, on errors, and on completion.
+
+    enqueue() snapshots the state, so a timer flush that fires mid-step still
+    writes the step boundary it was given rather than a half-updated context.
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        session_id: str,
+        project_path: Path,
+        max_batch: int = 8,
+        max_interval_s: float = 1.0,
+    ):
+        self.session_manager = session_manager
+        self.session_id = session_id
+        self.project_path = project_path
+        self.max_batch = max_batch
+        self.max_interval_s = max_interval_s
+        self._pending: dict[str, Any] | None = None
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def enqueue(self, state: dict[str, Any]) -> None:
+        """Record latest state, writing it if the batch size or interval is reached."""
+        # Shallow copies of the context and progress lists; their values are not copied
+        self._pending = {k: v.copy() if isinstance(v, dict | list) else v for k, v in state.items()}
+        self._pending_count += 1
+
+        if self._pending_count >= self.max_batch or time.monotonic() - self._last_flush >= self.max_interval_s:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_interval_s, self.flush)
+
+    def flush(self) -> None:
+        """Write pending state (if any) to disk now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._pending is None:
+            return
+
+        state = self._pending
+        self._pending = None
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+        self.session_manager.save_state(self.session_id, self.project_path, state)
+
+
 class RecipeExecutor:
     """Executes recipe workflows with checkpointing and resumption."""
 
-    def __init__(self, coordinator: Any, session_manager: SessionManager):
+    def __init__(
+        self,
+        coordinator: Any,
+        session_manager: SessionManager,
+        checkpoint_interval: int = 8,
+        checkpoint_max_seconds: float = 1.0,
+    ):
         """
         Initialize executor.
 
         Args:
             coordinator: Amplifier coordinator for agent spawning
             session_manager: Session persistence manager
+            checkpoint_interval: Write session state every N completed steps (1 = every step)
+            checkpoint_max_seconds: Upper bound on how long completed steps stay unwritten
         """
         self.coordinator = coordinator
         self.session_manager = session_manager
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_max_seconds = checkpoint_max_seconds
+        # Strong references so fire-and-forget tasks are not garbage collected mid-run
+        self._background_tasks: set[asyncio.Task] = set()
+        self._cleanup_task: asyncio.Task | None = None
 
     async def execute_recipe(
         self,
@@ -142,6 +289,9 @@ class RecipeExecutor:
         # Create or resume session
         is_resuming = session_id is not None
 
+        # Resolve once; every checkpoint records this string (resolve() stats each path component)
+        resolved_project = str(project_path.resolve())
+
         # Route to staged execution EARLY (staged recipes have different state structure)
         if recipe.is_staged:
             # For staged recipes, load minimal state for metadata, let _execute_staged_recipe handle the rest
@@ -151,7 +301,8 @@ class RecipeExecutor:
                 session_started = state["started"]
             else:
                 session_id = self.session_manager.create_session(recipe, project_path, recipe_path)
-                context = {**recipe.context, **context_vars}
+                # Deep copy: load_recipe shares cached Recipe objects between runs
+                context = {**copy.deepcopy(recipe.context), **context_vars}
                 session_started = datetime.datetime.now().isoformat()
 
             # Add metadata to context
@@ -163,7 +314,7 @@ class RecipeExecutor:
             context["session"] = {
                 "id": session_id,
                 "started": session_started,
-                "project": str(project_path.resolve()),
+                "project": resolved_project,
             }
 
             return await self._execute_staged_recipe(
@@ -174,6 +325,7 @@ class RecipeExecutor:
                 recipe_path=recipe_path,
                 recursion_state=recursion_state,
                 is_resuming=is_resuming,
+                checkpoints=self._checkpoint_batcher(session_id, project_path),
             )
 
         # Flat recipe state loading (uses current_step_index)
@@ -186,11 +338,13 @@ class RecipeExecutor:
         else:
             session_id = self.session_manager.create_session(recipe, project_path, recipe_path)
             current_step_index = 0
-            context = {**recipe.context, **context_vars}
+            # Deep copy: load_recipe shares cached Recipe objects between runs
+            context = {**copy.deepcopy(recipe.context), **context_vars}
             completed_steps = []
             session_started = datetime.datetime.now().isoformat()
 
-        # Add metadata to context
+        # Add metadata to context (kept in context, not split out of checkpoints:
+        # templates and conditions reference {{recipe.*}} and {{session.*}})
         context["recipe"] = {
             "name": recipe.name,
             "version": recipe.version,
@@ -199,11 +353,25 @@ class RecipeExecutor:
         context["session"] = {
             "id": session_id,
             "started": session_started,
-            "project": str(project_path.resolve()),
+            "project": resolved_project,
         }
 
-        # Initialize state for exception handler (will be set during execution)
-        state: dict[str, Any] | None = None
+        # Per-step checkpoints are coalesced; flushed on error and completion
+        checkpoints = self._checkpoint_batcher(session_id, project_path)
+
+        # Built once: context and completed_steps are updated in place, so each
+        # checkpoint only needs the new step index. enqueue() snapshots it, so a
+        # deferred write never sees the next step's partial updates.
+        state = {
+            "session_id": session_id,
+            "recipe_name": recipe.name,
+            "recipe_version": recipe.version,
+            "started": session_started,
+            "current_step_index": current_step_index,
+            "context": context,
+            "completed_steps": completed_steps,
+            "project_path": resolved_project,
+        }
 
         # Flat mode execution (staged recipes already returned above)
         try:
@@ -211,7 +379,8 @@ class RecipeExecutor:
             for i in range(current_step_index, len(recipe.steps)):
                 step = recipe.steps[i]
 
-                # Add step metadata to context
+                # Add step metadata to context (a fresh dict: a pending checkpoint
+                # shares the previous one, so mutating it would leak into that write)
                 context["step"] = {"id": step.id, "index": i}
 
                 # Check condition if present
@@ -223,9 +392,7 @@ class RecipeExecutor:
 
                     if not condition_result:
                         # Skip this step - record in state but don't execute
-                        skipped_steps = context.get("_skipped_steps", [])
-                        skipped_steps.append(step.id)
-                        context["_skipped_steps"] = skipped_steps
+                        _record_skipped(context, step.id)
                         continue
 
                 # Handle foreach loops
@@ -234,17 +401,8 @@ class RecipeExecutor:
                         await self._execute_loop(step, context, project_path, recursion_state, recipe_path)
                         # Update completed steps and session state after loop completes
                         completed_steps.append(step.id)
-                        state = {
-                            "session_id": session_id,
-                            "recipe_name": recipe.name,
-                            "recipe_version": recipe.version,
-                            "started": context["session"]["started"],
-                            "current_step_index": i + 1,
-                            "context": context,
-                            "completed_steps": completed_steps,
-                            "project_path": str(project_path.resolve()),
-                        }
-                        self.session_manager.save_state(session_id, project_path, state)
+                        state["current_step_index"] = i + 1
+                        checkpoints.enqueue(state)
                         continue
                     except SkipRemainingError:
                         break
@@ -266,20 +424,10 @@ class RecipeExecutor:
 
                     # Update completed steps and session state
                     completed_steps.append(step.id)
-
-                    state = {
-                        "session_id": session_id,
-                        "recipe_name": recipe.name,
-                        "recipe_version": recipe.version,
-                        "started": context["session"]["started"],
-                        "current_step_index": i + 1,
-                        "context": context,
-                        "completed_steps": completed_steps,
-                        "project_path": str(project_path.resolve()),
-                    }
+                    state["current_step_index"] = i + 1
 
                     # Checkpoint after each step
-                    self.session_manager.save_state(session_id, project_path, state)
+                    checkpoints.enqueue(state)
 
                 except SkipRemainingError:
                     # Skip remaining steps
@@ -287,12 +435,14 @@ class RecipeExecutor:
 
         except Exception:
             # Save state even on error for resumption
-            if state is not None:
-                self.session_manager.save_state(session_id, project_path, state)
+            checkpoints.flush()
             raise
 
-        # Cleanup old sessions
-        self.session_manager.cleanup_old_sessions(project_path)
+        checkpoints.flush()
+
+        # Cleanup old sessions (in the background; results need not wait on it)
+        if recursion_state.current_depth == 0:
+            self._schedule_cleanup(project_path)
 
         return context
 
@@ -305,6 +455,7 @@ class RecipeExecutor:
         recipe_path: Path | None,
         recursion_state: RecursionState,
         is_resuming: bool,
+        checkpoints: CheckpointBatcher,
     ) -> dict[str, Any]:
         """
         Execute a staged recipe with approval gates.
@@ -317,6 +468,7 @@ class RecipeExecutor:
             recipe_path: Optional path to recipe file
             recursion_state: Recursion tracking state
             is_resuming: Whether resuming an existing session
+            checkpoints: Batcher for per-step state checkpoints
 
         Returns:
             Final context dict with all step outputs
@@ -368,7 +520,8 @@ class RecipeExecutor:
             for stage_idx in range(current_stage_index, len(recipe.stages)):
                 stage = recipe.stages[stage_idx]
 
-                # Add stage metadata to context
+                # Add stage metadata to context (fresh dicts, as in flat mode: pending
+                # checkpoints share the previous stage and step dicts)
                 context["stage"] = {
                     "name": stage.name,
                     "index": stage_idx,
@@ -392,9 +545,7 @@ class RecipeExecutor:
                             raise ValueError(f"Step '{step.id}': condition error: {e}") from e
 
                         if not condition_result:
-                            skipped_steps = context.get("_skipped_steps", [])
-                            skipped_steps.append(step.id)
-                            context["_skipped_steps"] = skipped_steps
+                            _record_skipped(context, step.id)
                             continue
 
                     # Handle foreach loops
@@ -403,8 +554,7 @@ class RecipeExecutor:
                             await self._execute_loop(step, context, project_path, recursion_state, recipe_path)
                             completed_steps.append(step.id)
                             self._save_staged_state(
-                                session_id,
-                                project_path,
+                                checkpoints,
                                 recipe,
                                 context,
                                 stage_idx,
@@ -431,8 +581,7 @@ class RecipeExecutor:
 
                         completed_steps.append(step.id)
                         self._save_staged_state(
-                            session_id,
-                            project_path,
+                            checkpoints,
                             recipe,
                             context,
                             stage_idx,
@@ -451,8 +600,9 @@ class RecipeExecutor:
                     # Save state with next stage as target FIRST
                     # (set_pending_approval will load, add approval fields, and save)
                     self._save_staged_state(
-                        session_id, project_path, recipe, context, stage_idx + 1, 0, completed_stages, completed_steps
+                        checkpoints, recipe, context, stage_idx + 1, 0, completed_stages, completed_steps
                     )
+                    checkpoints.flush()
 
                     # Set pending approval AFTER saving state (this loads, modifies, saves)
                     self.session_manager.set_pending_approval(
@@ -473,7 +623,7 @@ class RecipeExecutor:
 
                 # No approval needed - save progress and continue
                 self._save_staged_state(
-                    session_id, project_path, recipe, context, stage_idx + 1, 0, completed_stages, completed_steps
+                    checkpoints, recipe, context, stage_idx + 1, 0, completed_stages, completed_steps
                 )
 
         except ApprovalGatePausedError:
@@ -482,8 +632,7 @@ class RecipeExecutor:
         except Exception:
             # Save state for resumption on error
             self._save_staged_state(
-                session_id,
-                project_path,
+                checkpoints,
                 recipe,
                 context,
                 current_stage_index,
@@ -491,17 +640,49 @@ class RecipeExecutor:
                 completed_stages,
                 completed_steps,
             )
+            checkpoints.flush()
             raise
 
-        # Cleanup old sessions
-        self.session_manager.cleanup_old_sessions(project_path)
+        checkpoints.flush()
+
+        # Cleanup old sessions (in the background; results need not wait on it)
+        if recursion_state.current_depth == 0:
+            self._schedule_cleanup(project_path)
 
         return context
 
+    def _checkpoint_batcher(self, session_id: str, project_path: Path) -> CheckpointBatcher:
+        """Create a checkpoint batcher using this executor's cadence settings."""
+        return CheckpointBatcher(
+            self.session_manager,
+            session_id,
+            project_path,
+            max_batch=self.checkpoint_interval,
+            max_interval_s=self.checkpoint_max_seconds,
+        )
+
+    def _schedule_cleanup(self, project_path: Path) -> None:
+        """Prune old sessions in a worker thread without delaying the caller.
+
+        At most one cleanup runs per executor; a run finishing while one is still
+        pruning skips its own, so threads never race over the sessions directory.
+        """
+        if self._cleanup_task is not None and not self._cleanup_task.done():
+            return
+        task = asyncio.create_task(asyncio.to_thread(self.session_manager.cleanup_old_sessions, project_path))
+        self._cleanup_task = task
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+
+    def _background_task_done(self, task: asyncio.Task) -> None:
+        """Release a finished background task, logging any failure."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background session cleanup failed: %s", task.exception())
+
     def _save_staged_state(
         self,
-        session_id: str,
-        project_path: Path,
+        checkpoints: CheckpointBatcher,
         recipe: Recipe,
         context: dict[str, Any],
         stage_index: int,
@@ -509,9 +690,9 @@ class RecipeExecutor:
         completed_stages: list[str],
         completed_steps: list[str],
     ) -> None:
-        """Save state for staged recipe execution."""
+        """Checkpoint state for staged recipe execution."""
         state = {
-            "session_id": session_id,
+            "session_id": checkpoints.session_id,
             "recipe_name": recipe.name,
             "recipe_version": recipe.version,
             "started": context["session"]["started"],
@@ -520,18 +701,21 @@ class RecipeExecutor:
             "context": context,
             "completed_stages": completed_stages,
             "completed_steps": completed_steps,
-            "project_path": str(project_path.resolve()),
+            "project_path": context["session"]["project"],
             "is_staged": True,
         }
-        self.session_manager.save_state(session_id, project_path, state)
+        checkpoints.enqueue(state)
 
-    async def execute_step_with_retry(self, step: Step, context: dict[str, Any]) -> Any:
+    async def execute_step_with_retry(
+        self, step: Step, context: Mapping[str, Any], plan: RetryPlan | None = None
+    ) -> Any:
         """
         Execute step with retry logic.
 
         Args:
             step: Step to execute
             context: Current context variables
+            plan: Retry settings already resolved for step (foreach loops resolve once)
 
         Returns:
             Step result
@@ -540,11 +724,12 @@ class RecipeExecutor:
             Exception if all retries fail and on_error='fail'
             SkipRemainingError if on_error='skip_remaining'
         """
-        retry_config = step.retry or {}
-        max_attempts = retry_config.get("max_attempts", 1)
-        backoff = retry_config.get("backoff", "exponential")
-        delay = retry_config.get("initial_delay", 5)
-        max_delay = retry_config.get("max_delay", 300)
+        if plan is None:
+            plan = RetryPlan.from_step(step)
+        max_attempts = plan.max_attempts
+        backoff = plan.backoff
+        delay = plan.initial_delay
+        max_delay = plan.max_delay
 
         last_error = None
 
@@ -579,7 +764,7 @@ class RecipeExecutor:
             raise last_error
         return None
 
-    async def execute_step(self, step: Step, context: dict[str, Any]) -> Any:
+    async def execute_step(self, step: Step, context: Mapping[str, Any]) -> Any:
         """
         Execute single step by spawning sub-agent.
 
@@ -656,9 +841,7 @@ class RecipeExecutor:
 
         if not items:
             # Empty list - skip step (common case, not an error)
-            skipped_steps = context.get("_skipped_steps", [])
-            skipped_steps.append(step.id)
-            context["_skipped_steps"] = skipped_steps
+            _record_skipped(context, step.id)
             return
 
         if len(items) > step.max_iterations:
@@ -695,7 +878,13 @@ class RecipeExecutor:
         recipe_path: Path | None = None,
     ) -> list[Any]:
         """Execute loop iterations sequentially."""
-        results = []
+        results: list[Any] = [None] * len(items)
+        plan = RetryPlan.from_step(step)
+
+        # Agent iterations are counted up front, as in the parallel path; recipe
+        # iterations are counted by the sub-recipe's own steps
+        if step.type != "recipe":
+            recursion_state.increment_steps_n(len(items))
 
         for idx, item in enumerate(items):
             # Set loop variable in context
@@ -706,9 +895,8 @@ class RecipeExecutor:
                 if step.type == "recipe":
                     result = await self._execute_recipe_step(step, context, project_path, recursion_state, recipe_path)
                 else:
-                    recursion_state.increment_steps()
-                    result = await self.execute_step_with_retry(step, context)
-                results.append(result)
+                    result = await self.execute_step_with_retry(step, context, plan)
+                results[idx] = result
             except SkipRemainingError:
                 # Propagate skip_remaining
                 raise
@@ -733,11 +921,12 @@ class RecipeExecutor:
         recipe_path: Path | None = None,
     ) -> list[Any]:
         """
-        Execute loop iterations in parallel using asyncio.gather.
+        Execute loop iterations in parallel, at most step.max_concurrency at a time (all at once if unset).
 
-        Each iteration gets its own context copy to avoid conflicts.
+        Each iteration sees the shared context through a ChainMap overlay holding
+        only its loop variable, so the context is never copied per item.
         Results are returned in the same order as input items.
-        Fail-fast: if any iteration fails, the entire step fails.
+        Fail-fast: the first failing iteration cancels the rest and fails the step.
         """
         # For agent steps, pre-check total steps limit (all will run in parallel)
         if step.type == "agent":
@@ -749,35 +938,42 @@ class RecipeExecutor:
             # Pre-increment for all iterations
             recursion_state.total_steps += len(items)
 
-        async def execute_iteration(idx: int, item: Any) -> Any:
-            """Execute a single iteration with isolated context."""
-            # Copy context and set loop variable for this iteration
-            iter_context = {**context, loop_var: item}
+        limit = asyncio.Semaphore(step.max_concurrency) if step.max_concurrency else contextlib.nullcontext()
+        plan = RetryPlan.from_step(step)
 
-            try:
-                if step.type == "recipe":
-                    return await self._execute_recipe_step(
-                        step, iter_context, project_path, recursion_state, recipe_path
-                    )
-                return await self.execute_step_with_retry(step, iter_context)
-            except SkipRemainingError:
-                raise
-            except Exception as e:
-                raise ValueError(f"Step '{step.id}' iteration {idx} failed: {e}") from e
+        async def execute_iteration(idx: int, item: Any) -> Any:
+            """Execute a single iteration with its loop variable overlaid on the shared context."""
+            # Writes land in the overlay, leaving the shared context untouched
+            iter_context = ChainMap({loop_var: item}, context)
 
-        # Create tasks for all iterations
-        tasks = [execute_iteration(idx, item) for idx, item in enumerate(items)]
+            async with limit:
+                try:
+                    if step.type == "recipe":
+                        return await self._execute_recipe_step(
+                            step, iter_context, project_path, recursion_state, recipe_path
+                        )
+                    return await self.execute_step_with_retry(step, iter_context, plan)
+                except SkipRemainingError:
+                    raise
+                except Exception as e:
+                    raise ValueError(f"Step '{step.id}' iteration {idx} failed: {e}") from e
 
-        # Run all tasks concurrently, fail-fast on any error
-        # asyncio.gather preserves order of results
-        results = await asyncio.gather(*tasks)
+        # TaskGroup cancels the remaining iterations as soon as one fails
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(execute_iteration(idx, item)) for idx, item in enumerate(items)]
+        except ExceptionGroup as eg:
+            # Surface the first failure itself (ValueError or SkipRemainingError), keeping its cause
+            first = eg.exceptions[0]
+            raise first from first.__cause__
 
-        return list(results)
+        # Task order matches input order regardless of completion order
+        return [task.result() for task in tasks]
 
     async def _execute_recipe_step(
         self,
         step: Step,
-        context: dict[str, Any],
+        context: Mapping[str, Any],
         project_path: Path,
         recursion_state: RecursionState,
         parent_recipe_path: Path | None = None,
@@ -805,22 +1001,20 @@ class RecipeExecutor:
             base_dir = project_path
 
         sub_recipe_path = base_dir / step.recipe
-        if not sub_recipe_path.exists():
-            raise FileNotFoundError(f"Sub-recipe not found: {sub_recipe_path}")
 
-        # Load sub-recipe
-        sub_recipe = Recipe.from_yaml(sub_recipe_path)
+        # Load sub-recipe (parsed once while the file is unchanged, even across foreach iterations)
+        try:
+            sub_recipe = load_recipe(sub_recipe_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Sub-recipe not found: {sub_recipe_path}") from None
 
         # Build sub-recipe context from step's context field (with variable substitution)
         # Context isolation: sub-recipe gets ONLY explicitly passed context
-        sub_context: dict[str, Any] = {}
-        if step.step_context:
-            for key, value in step.step_context.items():
-                if isinstance(value, str):
-                    # Substitute variables in string values
-                    sub_context[key] = self.substitute_variables(value, context)
-                else:
-                    sub_context[key] = value
+        # Only string values are templates; plain strings pass through substitute_variables as-is
+        sub_context: dict[str, Any] = {
+            key: self.substitute_variables(value, context) if isinstance(value, str) else value
+            for key, value in (step.step_context or {}).items()
+        }
 
         # Create child recursion state (with step-level override if present)
         child_state = recursion_state.enter_recipe(sub_recipe.name, step.recursion)
@@ -854,28 +1048,21 @@ class RecipeExecutor:
         Raises:
             ValueError: If variable syntax invalid or undefined
         """
-        pattern = r"\{\{(\w+(?:\.\w+)*)\}\}"
-        match = re.match(pattern, foreach.strip())
-        if not match:
-            raise ValueError(f"Invalid foreach syntax: {foreach}")
-
-        var_path = match.group(1)
-        parts = var_path.split(".")
         value = context
-        for part in parts:
-            if isinstance(value, dict) and part in value:
+        for part in _foreach_path(foreach):
+            if isinstance(value, Mapping) and part in value:
                 value = value[part]
             else:
                 raise ValueError(f"Undefined variable in foreach: {foreach}")
         return value
 
-    def substitute_variables(self, template: str, context: dict[str, Any]) -> str:
+    def substitute_variables(self, template: str, context: Mapping[str, Any]) -> str:
         """
         Replace {{variable}} references with context values.
 
         Args:
             template: String with {{variable}} placeholders
-            context: Dict with variable values
+            context: Mapping with variable values
 
         Returns:
             String with variables substituted
@@ -883,30 +1070,36 @@ class RecipeExecutor:
         Raises:
             ValueError if variable undefined
         """
-        pattern = r"\{\{(\w+(?:\.\w+)?)\}\}"
+        # Plain strings (most step_context values) need no parsing or copy
+        if "{{" not in template:
+            return template
 
-        def replace(match: re.Match) -> str:
-            var_ref = match.group(1)
+        chunks = []
+        for literal, var_ref in _compile_template(template):
+            chunks.append(literal)
+            if var_ref is None:
+                continue
 
             # Handle nested references (recipe.name, session.id, etc.)
             if "." in var_ref:
                 parts = var_ref.split(".")
                 value = context
                 for part in parts:
-                    if isinstance(value, dict) and part in value:
+                    if isinstance(value, Mapping) and part in value:
                         value = value[part]
                     else:
                         raise ValueError(
                             f"Undefined variable: {{{{{var_ref}}}}}. "
                             f"Available variables: {', '.join(sorted(context.keys()))}"
                         )
-                return str(value)
+                chunks.append(str(value))
+                continue
 
             # Handle direct references
             if var_ref not in context:
                 available = ", ".join(sorted(context.keys()))
                 raise ValueError(f"Undefined variable: {{{{{var_ref}}}}}. Available variables: {available}")
 
-            return str(context[var_ref])
+            chunks.append(str(context[var_ref]))
 
-        return re.sub(pattern, replace, template)
+        return "".join(chunks)
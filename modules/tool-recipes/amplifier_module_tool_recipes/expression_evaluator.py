@@ -9,9 +9,16 @@ Supports simple boolean expressions with:
 NO eval() or exec() - safe string parsing only.
 """
 
+import functools
 import re
+from dataclasses import dataclass
 from typing import Any
 
+_VARIABLE_PATTERN = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
+
+# Sentinel for keys absent from a context mapping
+_MISSING = object()
+
 
 class ExpressionError(Exception):
     """Error evaluating condition expression."""
@@ -35,75 +42,210 @@ def evaluate_condition(expression: str, context: dict[str, Any]) -> bool:
     if not expression or not expression.strip():
         return True  # Empty condition = always true
 
-    # Substitute variables first
-    substituted = _substitute_variables(expression, context)
+    return compile_condition(expression).evaluate(context)
 
-    # Parse and evaluate the expression
-    return _evaluate_expression(substituted.strip())
 
+@dataclass(frozen=True)
+class _Const:
+    """Operand or term with no variable references, resolved at compile time."""
 
-def _substitute_variables(expression: str, context: dict[str, Any]) -> str:
-    """Replace {{variable}} references with their values."""
-    pattern = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
+    value: str | bool
 
-    def replace_var(match: re.Match) -> str:
-        var_path = match.group(1)
-        value = _resolve_variable(var_path, context)
-        if value is None:
-            raise ExpressionError(f"Undefined variable: {var_path}")
-        # Convert to string representation for comparison
-        if isinstance(value, str):
-            return f"'{value}'"
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        return str(value)
+    def eval(self, values: dict[str, Any]) -> str | bool:
+        return self.value
 
-    return pattern.sub(replace_var, expression)
 
+@dataclass(frozen=True)
+class _Var:
+    """Operand that is exactly one variable reference, compared by value."""
+
+    path: str
+
+    def eval(self, values: dict[str, Any]) -> str | bool:
+        value = values[self.path]
+        if isinstance(value, str | bool):
+            return value
+        # Other types compare by their text, as a substituted literal would
+        return _parse_value(str(value))
+
+
+@dataclass(frozen=True)
+class _Template:
+    """Operand mixing literal text and variable references."""
+
+    segments: tuple[tuple[str, str | None], ...]
+
+    def eval(self, values: dict[str, Any]) -> str | bool:
+        return _parse_value(_render(self.segments, values))
+
+
+@dataclass(frozen=True)
+class _Compare:
+    """Equality (==) or inequality (!=) between two operands."""
+
+    left: "_Operand"
+    right: "_Operand"
+    negate: bool
+
+    def eval(self, values: dict[str, Any]) -> bool:
+        return (self.left.eval(values) == self.right.eval(values)) != self.negate
+
+
+@dataclass(frozen=True)
+class _Truth:
+    """Bare term that must read as a true/false literal."""
+
+    segments: tuple[tuple[str, str | None], ...]
+
+    def eval(self, values: dict[str, Any]) -> bool:
+        text = _render(self.segments, values).strip()
+        if text.lower() == "true":
+            return True
+        if text.lower() == "false":
+            return False
+        raise ExpressionError(f"Invalid expression syntax: {text}")
+
+
+@dataclass(frozen=True)
+class _And:
+    """Both sides true; the right side is skipped when the left is false."""
+
+    left: "_Node"
+    right: "_Node"
+
+    def eval(self, values: dict[str, Any]) -> bool:
+        return self.left.eval(values) and self.right.eval(values)
 
-def _resolve_variable(path: str, context: dict[str, Any]) -> Any:
-    """Resolve dotted variable path (e.g., 'step.id')."""
-    parts = path.split(".")
-    value = context
-    for part in parts:
-        if isinstance(value, dict) and part in value:
-            value = value[part]
-        else:
-            return None
-    return value
 
+@dataclass(frozen=True)
+class _Or:
+    """Either side true; the right side is skipped when the left is true."""
 
-def _evaluate_expression(expr: str) -> bool:
-    """Evaluate substituted expression to boolean."""
+    left: "_Node"
+    right: "_Node"
+
+    def eval(self, values: dict[str, Any]) -> bool:
+        return self.left.eval(values) or self.right.eval(values)
+
+
+_Operand = _Const | _Var | _Template
+_Node = _Or | _And | _Compare | _Truth | _Const
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """Condition parsed once into a tree of and/or/comparison nodes."""
+
+    root: _Node
+    variables: tuple[str, ...]
+
+    def evaluate(self, context: dict[str, Any]) -> bool:
+        """Resolve referenced variables from context and walk the tree.
+
+        Every referenced variable must be defined, even in branches that
+        and/or short-circuit past.
+        """
+        values = {}
+        for path in self.variables:
+            value = _resolve_variable(path, context)
+            if value is None:
+                raise ExpressionError(f"Undefined variable: {path}")
+            values[path] = value
+        return self.root.eval(values)
+
+
+@functools.lru_cache(maxsize=512)
+def compile_condition(expression: str) -> CompiledCondition:
+    """Parse a condition into an evaluation tree, once per distinct expression.
+
+    Structure comes from the expression text alone, so variable values
+    containing ' and ', ' or ' or '==' cannot change how it is parsed.
+    """
+    variables = tuple(dict.fromkeys(var for _, var in _compile_expression(expression) if var is not None))
+    return CompiledCondition(_compile_node(expression.strip()), variables)
+
+
+def _compile_node(expr: str) -> _Node:
+    """Build the tree for one (sub)expression."""
     expr = expr.strip()
 
     # Handle 'or' (lowest precedence)
     if " or " in expr:
-        parts = expr.split(" or ", 1)
-        return _evaluate_expression(parts[0]) or _evaluate_expression(parts[1])
+        left, right = expr.split(" or ", 1)
+        return _Or(_compile_node(left), _compile_node(right))
 
     # Handle 'and' (higher precedence than or)
     if " and " in expr:
-        parts = expr.split(" and ", 1)
-        return _evaluate_expression(parts[0]) and _evaluate_expression(parts[1])
+        left, right = expr.split(" and ", 1)
+        return _And(_compile_node(left), _compile_node(right))
 
     # Handle comparison operators
     for op in ("==", "!="):
         if op in expr:
             left, right = expr.split(op, 1)
-            left_val = _parse_value(left.strip())
-            right_val = _parse_value(right.strip())
-            if op == "==":
-                return left_val == right_val
-            return left_val != right_val
-
-    # Handle boolean literals
-    if expr.lower() == "true":
-        return True
-    if expr.lower() == "false":
-        return False
+            left_operand, right_operand = _compile_operand(left), _compile_operand(right)
+            if isinstance(left_operand, _Const) and isinstance(right_operand, _Const):
+                # Literal comparison: fold to its result
+                return _Const((left_operand.value == right_operand.value) != (op == "!="))
+            return _Compare(left_operand, right_operand, negate=op == "!=")
+
+    segments = _compile_expression(expr)
+    if len(segments) == 1 and expr.lower() in ("true", "false"):
+        return _Const(expr.lower() == "true")
+    return _Truth(segments)
+
+
+def _compile_operand(token: str) -> _Operand:
+    """Compile one side of a comparison."""
+    segments = _compile_expression(token.strip())
+    if len(segments) == 1:
+        return _Const(_parse_value(token))
+    if len(segments) == 2 and segments[0][0] == "" and segments[1][0] == "":
+        return _Var(segments[0][1])
+    return _Template(segments)
+
+
+def _render(segments: tuple[tuple[str, str | None], ...], values: dict[str, Any]) -> str:
+    """Join segments, writing variable values in expression syntax."""
+    chunks = []
+    for literal, var_path in segments:
+        chunks.append(literal)
+        if var_path is None:
+            continue
+
+        value = values[var_path]
+        # Convert to string representation for comparison
+        if isinstance(value, str):
+            chunks.append(f"'{value}'")
+        elif isinstance(value, bool):
+            chunks.append("true" if value else "false")
+        else:
+            chunks.append(str(value))
+
+    return "".join(chunks)
+
 
-    raise ExpressionError(f"Invalid expression syntax: {expr}")
+@functools.lru_cache(maxsize=512)
+def _compile_expression(expression: str) -> tuple[tuple[str, str | None], ...]:
+    """Split expression into (literal, variable path) segments, scanned once per expression."""
+    segments: list[tuple[str, str | None]] = []
+    pos = 0
+    for match in _VARIABLE_PATTERN.finditer(expression):
+        segments.append((expression[pos : match.start()], match.group(1)))
+        pos = match.end()
+    segments.append((expression[pos:], None))
+    return tuple(segments)
+
+
+def _resolve_variable(path: str, context: dict[str, Any]) -> Any:
+    """Resolve dotted variable path (e.g., 'step.id')."""
+    value = context
+    for part in path.split("."):
+        # One hash per component: .get() with a sentinel instead of `in` then indexing
+        value = value.get(part, _MISSING) if isinstance(value, dict) else _MISSING
+        if value is _MISSING:
+            return None
+    return value
 
 
 def _parse_value(token: str) -> str | bool:
@@ -1,15 +1,56 @@
 """Recipe data models and YAML parsing."""
 
+import functools
+import logging
+import os
+import re
+from collections import Counter
+from collections.abc import Collection
 from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
 from typing import Any
 from typing import Literal
 
-import yaml
+logger = logging.getLogger(__name__)
 
+# Separator characters allowed in names; deleted in one pass before the isalnum() check
+_STAGE_NAME_SEPARATORS = str.maketrans("", "", "-_ ")
+_RECIPE_NAME_SEPARATORS = str.maketrans("", "", "-_")
+_VARIABLE_NAME_SEPARATORS = str.maketrans("", "", "_")
 
-@dataclass
+_ON_ERROR_MODES = frozenset(("fail", "continue", "skip_remaining"))
+_BACKOFF_STRATEGIES = frozenset(("exponential", "linear"))
+# Context keys set by the executor, so not usable as step outputs
+_RESERVED_OUTPUTS = frozenset(("recipe", "session", "step"))
+
+# Same form the executor accepts for foreach: a leading {{variable}} or {{dotted.path}}
+_FOREACH_VARIABLE = re.compile(r"\{\{(\w+(?:\.\w+)*)\}\}")
+
+_SEMVER_PATTERN = re.compile(r"\d+\.\d+\.\d+")
+
+
+@functools.cache
+def yaml_loader() -> type:
+    """Return the YAML loader used for recipes.
+
+    Prefers the libyaml-backed CSafeLoader (several times faster), falling back to
+    the pure-Python SafeLoader. PyYAML is imported here, on first use, to keep it
+    off the module mount path.
+    """
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.cache
+def _warn_if_no_libyaml() -> None:
+    """Warn once when recipes will be parsed with the slow pure-Python YAML loader."""
+    if yaml_loader().__name__ != "CSafeLoader":
+        logger.warning("libyaml not available - recipe parsing will use the slower pure-Python YAML loader")
+
+
+@dataclass(slots=True)
 class RecursionConfig:
     """Recursion protection configuration for recipe composition."""
 
@@ -26,7 +67,7 @@ class RecursionConfig:
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class ApprovalConfig:
     """Approval gate configuration for a stage."""
 
@@ -47,7 +88,7 @@ class ApprovalConfig:
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class Stage:
     """Represents a stage in a multi-stage recipe workflow."""
 
@@ -62,7 +103,7 @@ class Stage:
         if not self.name:
             errors.append("Stage missing required field: name")
 
-        if not self.name.replace("-", "").replace("_", "").replace(" ", "").isalnum():
+        if not self.name.translate(_STAGE_NAME_SEPARATORS).isalnum():
             errors.append(f"Stage name must be alphanumeric with hyphens/underscores/spaces, got '{self.name}'")
 
         if not self.steps:
@@ -76,9 +117,9 @@ class Stage:
 
         # Check step ID uniqueness within stage
         step_ids = [step.id for step in self.steps]
-        duplicates = [sid for sid in step_ids if step_ids.count(sid) > 1]
+        duplicates = [sid for sid, n in Counter(step_ids).items() if n > 1]
         if duplicates:
-            errors.append(f"Stage '{self.name}': duplicate step IDs: {', '.join(set(duplicates))}")
+            errors.append(f"Stage '{self.name}': duplicate step IDs: {', '.join(duplicates)}")
 
         # Validate approval config if present
         if self.approval:
@@ -89,7 +130,7 @@ class Stage:
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class Step:
     """Represents a single step in a recipe workflow."""
 
@@ -112,6 +153,7 @@ class Step:
     as_var: str | None = None  # Maps to 'as' in YAML (as is Python reserved)
     collect: str | None = None
     parallel: bool = False  # Run all foreach iterations concurrently
+    max_concurrency: int | None = None  # Cap on simultaneously running parallel iterations (None = no cap)
     max_iterations: int = 100
     timeout: int = 600
     retry: dict[str, Any] | None = None
@@ -131,30 +173,9 @@ class Step:
 
         # Type-specific validation
         if self.type == "agent":
-            # Agent steps require agent and prompt
-            if not self.agent:
-                errors.append(f"Step '{self.id}': agent steps require 'agent' field")
-            if not self.prompt:
-                errors.append(f"Step '{self.id}': agent steps require 'prompt' field")
-            # Agent steps cannot have recipe-specific fields
-            if self.recipe:
-                errors.append(f"Step '{self.id}': agent steps cannot have 'recipe' field")
-            if self.step_context:
-                errors.append(f"Step '{self.id}': agent steps cannot have 'context' field")
+            errors.extend(self._validate_agent_fields())
         elif self.type == "recipe":
-            # Recipe steps require recipe path
-            if not self.recipe:
-                errors.append(f"Step '{self.id}': recipe steps require 'recipe' field")
-            # Recipe steps cannot have agent-specific fields
-            if self.agent:
-                errors.append(f"Step '{self.id}': recipe steps cannot have 'agent' field")
-            if self.prompt:
-                errors.append(f"Step '{self.id}': recipe steps cannot have 'prompt' field")
-            if self.mode:
-                errors.append(f"Step '{self.id}': recipe steps cannot have 'mode' field")
-            # Validate recursion config if present
-            if self.recursion:
-                errors.extend(self.recursion.validate())
+            errors.extend(self._validate_recipe_fields())
         else:
             errors.append(f"Step '{self.id}': type must be 'agent' or 'recipe', got '{self.type}'")
 
@@ -162,14 +183,14 @@ class Step:
         if self.timeout <= 0:
             errors.append(f"Step '{self.id}': timeout must be positive")
 
-        if self.on_error not in ("fail", "continue", "skip_remaining"):
+        if not isinstance(self.on_error, str) or self.on_error not in _ON_ERROR_MODES:
             errors.append(f"Step '{self.id}': on_error must be 'fail', 'continue', or 'skip_remaining'")
 
         # Output name validation
         if self.output:
-            if not self.output.replace("_", "").isalnum():
+            if not self.output.translate(_VARIABLE_NAME_SEPARATORS).isalnum():
                 errors.append(f"Step '{self.id}': output name must be alphanumeric with underscores")
-            if self.output in ("recipe", "session", "step"):
+            if self.output in _RESERVED_OUTPUTS:
                 errors.append(f"Step '{self.id}': output name '{self.output}' is reserved")
 
         # Retry validation
@@ -179,16 +200,16 @@ class Step:
                 errors.append(f"Step '{self.id}': retry.max_attempts must be positive integer")
 
             backoff = self.retry.get("backoff", "exponential")
-            if backoff not in ("exponential", "linear"):
+            if not isinstance(backoff, str) or backoff not in _BACKOFF_STRATEGIES:
                 errors.append(f"Step '{self.id}': retry.backoff must be 'exponential' or 'linear'")
 
         # Loop validation
         if self.foreach:
-            if "{{" not in self.foreach:
+            if not _FOREACH_VARIABLE.match(self.foreach.strip()):
                 errors.append(f"Step '{self.id}': foreach must contain a variable reference (e.g., '{{{{items}}}}')")
-            if self.as_var and not self.as_var.replace("_", "").isalnum():
+            if self.as_var and not self.as_var.translate(_VARIABLE_NAME_SEPARATORS).isalnum():
                 errors.append(f"Step '{self.id}': 'as' must be a valid variable name")
-            if self.collect and not self.collect.replace("_", "").isalnum():
+            if self.collect and not self.collect.translate(_VARIABLE_NAME_SEPARATORS).isalnum():
                 errors.append(f"Step '{self.id}': 'collect' must be a valid variable name")
             if self.max_iterations <= 0:
                 errors.append(f"Step '{self.id}': max_iterations must be positive")
@@ -196,11 +217,53 @@ class Step:
         # Parallel validation
         if self.parallel and not self.foreach:
             errors.append(f"Step '{self.id}': parallel requires foreach")
+        if self.max_concurrency is not None:
+            if (
+                not isinstance(self.max_concurrency, int)
+                or isinstance(self.max_concurrency, bool)
+                or self.max_concurrency <= 0
+            ):
+                errors.append(f"Step '{self.id}': max_concurrency must be positive integer")
+            if not self.parallel:
+                errors.append(f"Step '{self.id}': max_concurrency requires parallel")
+
+        return errors
+
+    def _validate_agent_fields(self) -> list[str]:
+        """Validate fields for type="agent" steps."""
+        errors = []
+        # Agent steps require agent and prompt
+        if not self.agent:
+            errors.append(f"Step '{self.id}': agent steps require 'agent' field")
+        if not self.prompt:
+            errors.append(f"Step '{self.id}': agent steps require 'prompt' field")
+        # Agent steps cannot have recipe-specific fields
+        if self.recipe:
+            errors.append(f"Step '{self.id}': agent steps cannot have 'recipe' field")
+        if self.step_context:
+            errors.append(f"Step '{self.id}': agent steps cannot have 'context' field")
+        return errors
 
+    def _validate_recipe_fields(self) -> list[str]:
+        """Validate fields for type="recipe" steps."""
+        errors = []
+        # Recipe steps require recipe path
+        if not self.recipe:
+            errors.append(f"Step '{self.id}': recipe steps require 'recipe' field")
+        # Recipe steps cannot have agent-specific fields
+        if self.agent:
+            errors.append(f"Step '{self.id}': recipe steps cannot have 'agent' field")
+        if self.prompt:
+            errors.append(f"Step '{self.id}': recipe steps cannot have 'prompt' field")
+        if self.mode:
+            errors.append(f"Step '{self.id}': recipe steps cannot have 'mode' field")
+        # Validate recursion config if present
+        if self.recursion:
+            errors.extend(self.recursion.validate())
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     """Represents a complete recipe specification.
 
@@ -231,10 +294,7 @@ class Recipe:
     def get_all_steps(self) -> list[Step]:
         """Get all steps from either flat or staged mode."""
         if self.is_staged:
-            all_steps = []
-            for stage in self.stages:
-                all_steps.extend(stage.steps)
-            return all_steps
+            return [step for stage in self.stages for step in stage.steps]
         return self.steps
 
     @classmethod
@@ -296,8 +356,11 @@ class Recipe:
         if not path.exists():
             raise FileNotFoundError(f"Recipe file not found: {path}")
 
-        with open(path, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        import yaml  # Deferred import, see yaml_loader()
+
+        # Bytes go straight to the loader, which decodes UTF-8 itself
+        with open(path, "rb") as f:
+            data = yaml.load(f, Loader=yaml_loader())
 
         if not isinstance(data, dict):
             raise ValueError("Recipe YAML must be a dictionary")
@@ -360,11 +423,12 @@ class Recipe:
             errors.append("Recipe missing required field: version")
 
         # Name constraints
-        if self.name and not self.name.replace("-", "").replace("_", "").isalnum():
+        if self.name and not self.name.translate(_RECIPE_NAME_SEPARATORS).isalnum():
             errors.append("Recipe name must be alphanumeric with hyphens/underscores")
 
         # Version format (strict semver check - MAJOR.MINOR.PATCH only)
-        if self.version:
+        # Valid versions take the single regex match; the checks below only pick the error message
+        if self.version and not _SEMVER_PATTERN.fullmatch(self.version):
             # Check for v prefix (not allowed)
             if self.version.startswith("v"):
                 errors.append("Recipe version must follow semver format without 'v' prefix (use '1.0.0' not 'v1.0.0')")
@@ -405,24 +469,27 @@ class Recipe:
             step_errors = step.validate()
             errors.extend(step_errors)
 
-        # Check step ID uniqueness
-        step_ids = [step.id for step in self.steps]
-        duplicates = [sid for sid in step_ids if step_ids.count(sid) > 1]
+        # Check step ID uniqueness (the counts double as the set of known IDs below)
+        step_counts = Counter(step.id for step in self.steps)
+        duplicates = [sid for sid, n in step_counts.items() if n > 1]
         if duplicates:
-            errors.append(f"Duplicate step IDs: {', '.join(set(duplicates))}")
+            errors.append(f"Duplicate step IDs: {', '.join(duplicates)}")
 
         # Validate depends_on references
-        step_id_set = set(step_ids)
         for step in self.steps:
             for dep_id in step.depends_on:
-                if dep_id not in step_id_set:
+                if dep_id not in step_counts:
                     errors.append(f"Step '{step.id}': depends_on references unknown step '{dep_id}'")
 
-        # Check for circular dependencies (simple check)
+        # Check for circular dependencies
         for step in self.steps:
             if step.id in step.depends_on:
                 errors.append(f"Step '{step.id}': cannot depend on itself")
 
+        cyclic = _steps_in_cycles(self.steps, step_counts.keys())
+        if cyclic:
+            errors.append(f"Circular dependency between steps: {', '.join(cyclic)}")
+
         return errors
 
     def _validate_staged_mode(self) -> list[str]:
@@ -431,30 +498,27 @@ class Recipe:
 
         # Check stage name uniqueness
         stage_names = [stage.name for stage in self.stages]
-        duplicates = [name for name in stage_names if stage_names.count(name) > 1]
+        duplicates = [name for name, n in Counter(stage_names).items() if n > 1]
         if duplicates:
-            errors.append(f"Duplicate stage names: {', '.join(set(duplicates))}")
+            errors.append(f"Duplicate stage names: {', '.join(duplicates)}")
 
         # Validate each stage
         for stage in self.stages:
             stage_errors = stage.validate()
             errors.extend(stage_errors)
 
-        # Check step ID uniqueness across all stages
-        all_step_ids = []
-        for stage in self.stages:
-            all_step_ids.extend([step.id for step in stage.steps])
-
-        step_duplicates = [sid for sid in all_step_ids if all_step_ids.count(sid) > 1]
+        # Check step ID uniqueness across all stages (the counts double as the set of known IDs below)
+        all_steps = self.get_all_steps()
+        step_counts = Counter(step.id for step in all_steps)
+        step_duplicates = [sid for sid, n in step_counts.items() if n > 1]
         if step_duplicates:
-            errors.append(f"Duplicate step IDs across stages: {', '.join(set(step_duplicates))}")
+            errors.append(f"Duplicate step IDs across stages: {', '.join(step_duplicates)}")
 
         # Validate depends_on references across all stages
-        step_id_set = set(all_step_ids)
         for stage in self.stages:
             for step in stage.steps:
                 for dep_id in step.depends_on:
-                    if dep_id not in step_id_set:
+                    if dep_id not in step_counts:
                         errors.append(
                             f"Stage '{stage.name}', Step '{step.id}': depends_on references unknown step '{dep_id}'"
                         )
@@ -465,6 +529,10 @@ class Recipe:
                 if step.id in step.depends_on:
                     errors.append(f"Stage '{stage.name}', Step '{step.id}': cannot depend on itself")
 
+        cyclic = _steps_in_cycles(all_steps, step_counts.keys())
+        if cyclic:
+            errors.append(f"Circular dependency between steps: {', '.join(cyclic)}")
+
         return errors
 
     def get_step(self, step_id: str) -> Step | None:
@@ -480,3 +548,85 @@ class Recipe:
             if stage.name == stage_name:
                 return stage
         return None
+
+
+def _steps_in_cycles(steps: list[Step], step_ids: Collection[str]) -> list[str]:
+    """Return IDs of steps on a depends_on cycle, in recipe order.
+
+    A step is on a cycle exactly when its strongly connected component (found
+    with an iterative Tarjan walk, O(V + E)) holds more than one step, so steps
+    that only depend on, or sit between, cycles are not reported.
+    Self-dependencies and unknown IDs are reported separately and ignored here.
+    step_ids holds each ID in steps once.
+    """
+    depends_on: dict[str, list[str]] = {sid: [] for sid in step_ids}
+    for step in steps:
+        for dep_id in step.depends_on:
+            if dep_id in depends_on and dep_id != step.id:
+                depends_on[step.id].append(dep_id)
+
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    cyclic: set[str] = set()
+
+    for root in step_ids:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        # Explicit DFS frames (step ID, remaining dependencies) instead of recursion
+        frames = [(root, iter(depends_on[root]))]
+        while frames:
+            sid, deps = frames[-1]
+            for dep_id in deps:
+                if dep_id not in index:
+                    index[dep_id] = lowlink[dep_id] = len(index)
+                    stack.append(dep_id)
+                    on_stack.add(dep_id)
+                    frames.append((dep_id, iter(depends_on[dep_id])))
+                    break
+                if dep_id in on_stack:
+                    lowlink[sid] = min(lowlink[sid], index[dep_id])
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[sid])
+                if lowlink[sid] == index[sid]:
+                    # sid is the root of a component: pop it off the stack
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == sid:
+                            break
+                    if len(component) > 1:
+                        cyclic.update(component)
+
+    return [sid for sid in step_ids if sid in cyclic]
+
+
+def load_recipe(recipe_path: Path) -> Recipe:
+    """Load recipe from YAML, reusing the parsed recipe while the file is unchanged.
+
+    The returned Recipe is shared by every caller loading the same file, so it
+    must be treated as read-only; the executor deep-copies its context per run.
+    """
+    try:
+        stat = os.stat(recipe_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Recipe file not found: {recipe_path}") from None
+    # Absolute paths are already stable cache keys; only relative ones need resolving
+    path_str = str(recipe_path) if recipe_path.is_absolute() else str(recipe_path.resolve())
+    return _load_recipe_cached(path_str, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _load_recipe_cached(path_str: str, mtime_ns: int, size: int) -> Recipe:
+    """Parse recipe file (cached by path, mtime and size so edits invalidate the entry)."""
+    _warn_if_no_libyaml()
+    return Recipe.from_yaml(Path(path_str))
@@ -2,14 +2,29 @@
 
 import datetime
 import json
+import math
+import operator
+import os
+import re
+import secrets
 import shutil
 import uuid
+from collections.abc import Iterator
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
 from .models import Recipe
 
+try:
+    import orjson
+except ImportError:  # Optional speedup (install the 'fast' extra)
+    orjson = None
+
+
+# YYYYMMDD-HHMMSS creation time embedded in session IDs by generate_session_id
+_SESSION_ID_TIMESTAMP = re.compile(r"-(\d{8}-\d{6})_")
+
 
 class ApprovalStatus(str, Enum):
     """Approval status for a stage."""
@@ -21,6 +36,76 @@ class ApprovalStatus(str, Enum):
     TIMEOUT = "timeout"  # Timed out waiting for approval
 
 
+def _json_default(obj: Any) -> Any:
+    """Encode the extra types orjson handles natively, so both encoders agree."""
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return True if obj holds a NaN or infinite float anywhere."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list | tuple):
+            stack.extend(value)
+    return False
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when installed.
+
+    Accepts and rejects the same values whether or not orjson is installed:
+    dates, datetimes, dataclasses and subclasses of builtin types are passed
+    through orjson to the stdlib encoder, which also handles integers beyond
+    64 bits and writes NaN/Infinity (orjson would write null) as json.dump does.
+    Pass indent=True for human-readable two-space indentation.
+
+    Raises:
+        TypeError: If obj contains a value JSON cannot represent
+    """
+    if orjson is not None:
+        # Types the stdlib encoder rejects or encodes differently are handed to it instead
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_SUBCLASS
+            | (orjson.OPT_INDENT_2 if indent else 0)
+        )
+        try:
+            data = orjson.dumps(obj, default=_json_default, option=option)
+        except TypeError:
+            pass
+        else:
+            # orjson writes non-finite floats as null; only then is a walk needed
+            if b"null" not in data or not _has_non_finite(obj):
+                return data
+    return json.dumps(obj, ensure_ascii=False, default=_json_default, indent=2 if indent else None).encode("utf-8")
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Parse JSON, using orjson when installed.
+
+    Raises:
+        json.JSONDecodeError: On malformed input (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity written by the stdlib encoder; still raises if malformed
+            pass
+    return json.loads(data)
+
+
 def generate_session_id() -> str:
     """Generate unique session ID following W3C Trace Context pattern.
 
@@ -37,7 +122,7 @@ def generate_session_id() -> str:
         Session ID string in W3C Trace Context compatible format
     """
     # Generate 16-char hex span ID (W3C Trace Context standard)
-    span_id = uuid.uuid4().hex[:16]
+    span_id = secrets.token_hex(8)
 
     # Human-readable timestamp (YYYYMMDD-HHMMSS)
     timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -60,6 +145,37 @@ def get_project_slug(project_path: Path) -> str:
     return slug
 
 
+def _clear_pending_fields(state: dict[str, Any]) -> None:
+    """Remove pending approval fields from session state (in place)."""
+    state.pop("pending_approval_stage", None)
+    state.pop("pending_approval_prompt", None)
+    state.pop("pending_approval_timeout", None)
+    state.pop("pending_approval_default", None)
+    state.pop("pending_approval_requested_at", None)
+
+
+def _pending_approval_info(session_id: str, state: dict[str, Any]) -> dict[str, Any] | None:
+    """Project the pending approval fields of a session state, or None if nothing is pending."""
+    pending_stage = state.get("pending_approval_stage")
+    if not pending_stage:
+        return None
+
+    return {
+        "session_id": session_id,
+        "recipe_name": state.get("recipe_name", "unknown"),
+        "stage_name": pending_stage,
+        "approval_prompt": state.get("pending_approval_prompt", ""),
+        "approval_timeout": state.get("pending_approval_timeout", 0),
+        "approval_requested_at": state.get("pending_approval_requested_at"),
+        "approval_default": state.get("pending_approval_default", "deny"),
+    }
+
+
+def _read_state(session_dir: Path) -> dict[str, Any]:
+    """Read a session's state.json."""
+    return loads_json((session_dir / "state.json").read_bytes())
+
+
 class SessionManager:
     """Manages recipe session persistence and cleanup."""
 
@@ -73,11 +189,19 @@ class SessionManager:
         """
         self.base_dir = Path(base_dir).expanduser()
         self.auto_cleanup_days = auto_cleanup_days
+        self._sessions_dirs: dict[Path, Path] = {}
 
     def get_sessions_dir(self, project_path: Path) -> Path:
         """Get sessions directory for project."""
+        # Memoize absolute paths only: a relative path's meaning changes with the cwd
+        if project_path.is_absolute() and project_path in self._sessions_dirs:
+            return self._sessions_dirs[project_path]
+
         slug = get_project_slug(project_path)
-        return self.base_dir / slug / "recipe-sessions"
+        sessions_dir = self.base_dir / slug / "recipe-sessions"
+        if project_path.is_absolute():
+            self._sessions_dirs[project_path] = sessions_dir
+        return sessions_dir
 
     def create_session(self, recipe: Recipe, project_path: Path, recipe_path: Path | None = None) -> str:
         """
@@ -99,8 +223,6 @@ class SessionManager:
 
         # Save copy of recipe to session directory
         if recipe_path and recipe_path.exists():
-            import shutil
-
             shutil.copy2(recipe_path, session_dir / "recipe.yaml")
 
         # Initialize state
@@ -130,20 +252,33 @@ class SessionManager:
         session_dir = self.get_session_dir(session_id, project_path)
         state_file = session_dir / "state.json"
 
-        # Write with retry (cloud sync issues)
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
+        # Serialize up front so the snapshot is a single write, then swap it in
+        # atomically; readers never observe a partially written state.json
+        tmp_file = session_dir / "state.json.tmp"
+        tmp_file.write_bytes(dumps_json(state, indent=True))
+        tmp_file.replace(state_file)
 
-    def load_state(self, session_id: str, project_path: Path) -> dict[str, Any]:
-        """Load session state from disk."""
-        session_dir = self.get_session_dir(session_id, project_path)
-        state_file = session_dir / "state.json"
+    def save_context(self, session_id: str, project_path: Path, context_json: bytes) -> Path:
+        """Write serialized final context to the session directory.
+
+        Args:
+            session_id: Session identifier
+            project_path: Project directory
+            context_json: Context already serialized to UTF-8 JSON
 
-        if not state_file.exists():
-            raise FileNotFoundError(f"Session state not found: {session_id}")
+        Returns:
+            Path to the written context file
+        """
+        context_file = self.get_session_dir(session_id, project_path) / "context.json"
+        context_file.write_bytes(context_json)
+        return context_file
 
-        with open(state_file, encoding="utf-8") as f:
-            return json.load(f)
+    def load_state(self, session_id: str, project_path: Path) -> dict[str, Any]:
+        """Load session state from disk."""
+        try:
+            return _read_state(self.get_session_dir(session_id, project_path))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Session state not found: {session_id}") from None
 
     def session_exists(self, session_id: str, project_path: Path) -> bool:
         """Check if session exists."""
@@ -151,6 +286,38 @@ class SessionManager:
         state_file = session_dir / "state.json"
         return state_file.exists()
 
+    def _iter_session_dirs(self, project_path: Path) -> Iterator[Path]:
+        """Yield the project's session directories.
+
+        Uses os.scandir so the directory check comes from the listing itself rather
+        than a stat per entry. A missing state.json is not checked here; callers
+        already skip sessions they cannot read.
+        """
+        try:
+            entries = os.scandir(self.get_sessions_dir(project_path))
+        except FileNotFoundError:
+            return
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield Path(entry.path)
+
+    def _iter_session_states(self, project_path: Path) -> Iterator[tuple[Path, dict[str, Any]]]:
+        """Yield (session_dir, state) for each session, reading each state once.
+
+        Corrupted sessions are skipped.
+        """
+        for session_dir in self._iter_session_dirs(project_path):
+            try:
+                state = _read_state(session_dir)
+            except Exception:
+                # Skip corrupted sessions
+                continue
+
+            if isinstance(state, dict):
+                yield session_dir, state
+
     def list_sessions(self, project_path: Path) -> list[dict[str, Any]]:
         """
         List all sessions for project.
@@ -162,39 +329,19 @@ class SessionManager:
         - current_step_index
         - completed_steps
         """
-        sessions_dir = self.get_sessions_dir(project_path)
-
-        if not sessions_dir.exists():
-            return []
-
-        sessions = []
-        for session_dir in sessions_dir.iterdir():
-            if not session_dir.is_dir():
-                continue
-
-            state_file = session_dir / "state.json"
-            if not state_file.exists():
-                continue
-
-            try:
-                with open(state_file, encoding="utf-8") as f:
-                    state = json.load(f)
-
-                sessions.append(
-                    {
-                        "session_id": state.get("session_id", session_dir.name),
-                        "recipe_name": state.get("recipe_name", "unknown"),
-                        "started": state.get("started"),
-                        "current_step_index": state.get("current_step_index", 0),
-                        "completed_steps": state.get("completed_steps", []),
-                    }
-                )
-            except Exception:
-                # Skip corrupted sessions
-                continue
+        sessions = [
+            {
+                "session_id": state.get("session_id", session_dir.name),
+                "recipe_name": state.get("recipe_name", "unknown"),
+                "started": state.get("started"),
+                "current_step_index": state.get("current_step_index", 0),
+                "completed_steps": state.get("completed_steps", []),
+            }
+            for session_dir, state in self._iter_session_states(project_path)
+        ]
 
         # Sort by started time (newest first)
-        sessions.sort(key=lambda s: s.get("started", ""), reverse=True)
+        sessions.sort(key=operator.itemgetter("started"), reverse=True)
 
         return sessions
 
@@ -204,36 +351,40 @@ class SessionManager:
 
         Returns number of sessions deleted.
         """
-        sessions_dir = self.get_sessions_dir(project_path)
-
-        if not sessions_dir.exists():
-            return 0
-
         cutoff = datetime.datetime.now() - datetime.timedelta(days=self.auto_cleanup_days)
+        cutoff_ts = cutoff.timestamp()
+        # The ID timestamp format sorts chronologically, so it compares as a plain string
+        cutoff_token = cutoff.strftime("%Y%m%d-%H%M%S")
         deleted_count = 0
 
-        for session_dir in sessions_dir.iterdir():
-            if not session_dir.is_dir():
-                continue
-
-            state_file = session_dir / "state.json"
-            if not state_file.exists():
-                continue
-
+        for session_dir in self._iter_session_dirs(project_path):
             try:
-                with open(state_file, encoding="utf-8") as f:
-                    state = json.load(f)
+                state_file = session_dir / "state.json"
 
-                started_str = state.get("started")
-                if not started_str:
+                # Sessions whose ID records a creation time before the cutoff are old
+                # without any file access (the ID is generated just before "started")
+                match = _SESSION_ID_TIMESTAMP.search(session_dir.name)
+                if match and match.group(1) < cutoff_token:
+                    shutil.rmtree(session_dir)
+                    deleted_count += 1
                     continue
 
-                started = datetime.datetime.fromisoformat(started_str.replace("Z", "+00:00"))
+                # A session whose state was last written before the cutoff also started
+                # before it; only recently written sessions need their state parsed
+                if state_file.stat().st_mtime >= cutoff_ts:
+                    state = loads_json(state_file.read_bytes())
 
-                if started < cutoff:
-                    # Delete old session
-                    shutil.rmtree(session_dir)
-                    deleted_count += 1
+                    started_str = state.get("started")
+                    if not started_str:
+                        continue
+
+                    started = datetime.datetime.fromisoformat(started_str.replace("Z", "+00:00"))
+                    if started >= cutoff:
+                        continue
+
+                # Delete old session
+                shutil.rmtree(session_dir)
+                deleted_count += 1
 
             except Exception:
                 # Skip problematic sessions
@@ -276,24 +427,61 @@ class SessionManager:
             status: New approval status
             reason: Optional reason (e.g., denial reason)
         """
+        self.set_stage_approval_statuses(session_id, project_path, [(stage_name, status, reason)])
+
+    def set_stage_approval_statuses(
+        self,
+        session_id: str,
+        project_path: Path,
+        updates: list[tuple[str, ApprovalStatus, str | None]],
+    ) -> None:
+        """Set approval status for several stages with a single state load and save.
+
+        Args:
+            session_id: Session identifier
+            project_path: Project directory
+            updates: (stage_name, status, reason) tuples, applied in order
+        """
         state = self.load_state(session_id, project_path)
+        self.apply_stage_approvals(session_id, project_path, state, updates)
+
+    def apply_stage_approvals(
+        self,
+        session_id: str,
+        project_path: Path,
+        state: dict[str, Any],
+        updates: list[tuple[str, ApprovalStatus, str | None]],
+        clear_pending: bool = False,
+    ) -> None:
+        """Apply approval decisions to already-loaded state and save it once.
 
+        Args:
+            session_id: Session identifier
+            project_path: Project directory
+            state: Session state previously returned by load_state/load_pending_approval
+            updates: (stage_name, status, reason) tuples, applied in order
+            clear_pending: Also clear the pending approval in the same write
+        """
         if "stage_approvals" not in state:
             state["stage_approvals"] = {}
         if "approval_history" not in state:
             state["approval_history"] = []
 
-        state["stage_approvals"][stage_name] = status.value
+        for stage_name, status, reason in updates:
+            state["stage_approvals"][stage_name] = status.value
+
+            # Record in history
+            state["approval_history"].append(
+                {
+                    "stage": stage_name,
+                    "status": status.value,
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "reason": reason,
+                }
+            )
 
-        # Record in history
-        state["approval_history"].append(
-            {
-                "stage": stage_name,
-                "status": status.value,
-                "timestamp": datetime.datetime.now().isoformat(),
-                "reason": reason,
-            }
-        )
+        if clear_pending:
+            _clear_pending_fields(state)
 
         self.save_state(session_id, project_path, state)
 
@@ -307,21 +495,26 @@ class SessionManager:
         Returns:
             Dict with stage info and approval prompt, or None if no pending approval
         """
-        state = self.load_state(session_id, project_path)
+        _, pending = self.load_pending_approval(session_id, project_path)
+        return pending
 
-        pending_stage = state.get("pending_approval_stage")
-        if not pending_stage:
-            return None
+    def load_pending_approval(
+        self, session_id: str, project_path: Path
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Load session state together with its pending approval using a single read.
 
-        return {
-            "session_id": session_id,
-            "recipe_name": state.get("recipe_name", "unknown"),
-            "stage_name": pending_stage,
-            "approval_prompt": state.get("pending_approval_prompt", ""),
-            "approval_timeout": state.get("pending_approval_timeout", 0),
-            "approval_requested_at": state.get("pending_approval_requested_at"),
-            "approval_default": state.get("pending_approval_default", "deny"),
-        }
+        Args:
+            session_id: Session identifier
+            project_path: Project directory
+
+        Returns:
+            Tuple of (state, pending approval info or None)
+
+        Raises:
+            FileNotFoundError: If the session does not exist
+        """
+        state = self.load_state(session_id, project_path)
+        return state, _pending_approval_info(session_id, state)
 
     def set_pending_approval(
         self,
@@ -360,13 +553,7 @@ class SessionManager:
     def clear_pending_approval(self, session_id: str, project_path: Path) -> None:
         """Clear pending approval after it has been processed."""
         state = self.load_state(session_id, project_path)
-
-        state.pop("pending_approval_stage", None)
-        state.pop("pending_approval_prompt", None)
-        state.pop("pending_approval_timeout", None)
-        state.pop("pending_approval_default", None)
-        state.pop("pending_approval_requested_at", None)
-
+        _clear_pending_fields(state)
         self.save_state(session_id, project_path, state)
 
     def list_pending_approvals(self, project_path: Path) -> list[dict[str, Any]]:
@@ -378,16 +565,15 @@ class SessionManager:
         Returns:
             List of pending approval info dicts
         """
-        sessions = self.list_sessions(project_path)
+        # One read per session; ordered newest first, like list_sessions
         pending = []
-
-        for session_info in sessions:
-            session_id = session_info["session_id"]
-            approval_info = self.get_pending_approval(session_id, project_path)
+        for session_dir, state in self._iter_session_states(project_path):
+            approval_info = _pending_approval_info(state.get("session_id", session_dir.name), state)
             if approval_info:
-                pending.append(approval_info)
+                pending.append((state.get("started", ""), approval_info))
 
-        return pending
+        pending.sort(key=operator.itemgetter(0), reverse=True)
+        return [approval_info for _, approval_info in pending]
 
     def check_approval_timeout(self, session_id: str, project_path: Path) -> ApprovalStatus | None:
         """Check if pending approval has timed out.
@@ -395,7 +581,7 @@ class SessionManager:
         Returns:
             ApprovalStatus if timeout occurred and was applied, None otherwise
         """
-        approval_info = self.get_pending_approval(session_id, project_path)
+        state, approval_info = self.load_pending_approval(session_id, project_path)
         if not approval_info:
             return None
 
@@ -412,18 +598,14 @@ class SessionManager:
             stage_name = approval_info["stage_name"]
             default = approval_info.get("approval_default", "deny")
 
-            # Apply default action
+            # Apply default action and clear the pending approval in one write
             if default == "approve":
-                self.set_stage_approval_status(
-                    session_id, project_path, stage_name, ApprovalStatus.APPROVED, reason="Timeout - auto-approved"
-                )
-                self.clear_pending_approval(session_id, project_path)
-                return ApprovalStatus.APPROVED
-
-            self.set_stage_approval_status(
-                session_id, project_path, stage_name, ApprovalStatus.TIMEOUT, reason="Timeout - auto-denied"
+                status, reason = ApprovalStatus.APPROVED, "Timeout - auto-approved"
+            else:
+                status, reason = ApprovalStatus.TIMEOUT, "Timeout - auto-denied"
+            self.apply_stage_approvals(
+                session_id, project_path, state, [(stage_name, status, reason)], clear_pending=True
             )
-            self.clear_pending_approval(session_id, project_path)
-            return ApprovalStatus.TIMEOUT
+            return status
 
         return None
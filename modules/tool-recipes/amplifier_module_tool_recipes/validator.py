@@ -1,11 +1,17 @@
 """Recipe validation logic."""
 
+import functools
 import re
 from dataclasses import dataclass
 from typing import Any
 
 from .models import Recipe
 
+_TEMPLATE_VARIABLE = re.compile(r"\{\{(\w+(?:\.\w+)?)\}\}")
+
+# Reserved variables always available
+_RESERVED_VARIABLES = frozenset(("recipe", "session", "step"))
+
 
 @dataclass
 class ValidationResult:
@@ -60,11 +66,8 @@ def check_variable_references(recipe: Recipe) -> list[str]:
     """Check all {{variable}} references are defined or will be defined."""
     errors = []
 
-    # Reserved variables always available
-    reserved = {"recipe", "session", "step"}
-
     # Build set of available variables step by step
-    available = set(recipe.context.keys()) | reserved
+    available = set(recipe.context.keys()) | _RESERVED_VARIABLES
 
     for step in recipe.steps:
         # For foreach loops, the loop variable is available within the step
@@ -81,7 +84,7 @@ def check_variable_references(recipe: Recipe) -> list[str]:
                 if "." in var:
                     prefix = var.split(".")[0]
                     # Check if prefix is in reserved (recipe/session/step) OR available (step outputs)
-                    if prefix not in reserved and prefix not in available and prefix not in step_local_vars:
+                    if prefix not in _RESERVED_VARIABLES and prefix not in available and prefix not in step_local_vars:
                         errors.append(
                             f"Step '{step.id}': Variable {{{{{var}}}}} references unknown namespace '{prefix}'"
                         )
@@ -100,7 +103,11 @@ def check_variable_references(recipe: Recipe) -> list[str]:
                         if "." in var:
                             prefix = var.split(".")[0]
                             # Check if prefix is in reserved (recipe/session/step) OR available (step outputs)
-                            if prefix not in reserved and prefix not in available and prefix not in step_local_vars:
+                            if (
+                                prefix not in _RESERVED_VARIABLES
+                                and prefix not in available
+                                and prefix not in step_local_vars
+                            ):
                                 errors.append(
                                     f"Step '{step.id}': Context key '{key}' variable {{{{{var}}}}} references unknown namespace '{prefix}'"
                                 )
@@ -117,7 +124,7 @@ def check_variable_references(recipe: Recipe) -> list[str]:
                 if "." in var:
                     prefix = var.split(".")[0]
                     # Check if prefix is in reserved (recipe/session/step) OR available (step outputs)
-                    if prefix not in reserved and prefix not in available and prefix not in step_local_vars:
+                    if prefix not in _RESERVED_VARIABLES and prefix not in available and prefix not in step_local_vars:
                         errors.append(
                             f"Step '{step.id}': Recipe path variable {{{{{var}}}}} references unknown namespace '{prefix}'"
                         )
@@ -138,11 +145,14 @@ def check_variable_references(recipe: Recipe) -> list[str]:
     return errors
 
 
-def extract_variables(template: str) -> set[str]:
-    """Extract all {{variable}} references from template string."""
-    pattern = r"\{\{(\w+(?:\.\w+)?)\}\}"
-    matches = re.findall(pattern, template)
-    return set(matches)
+@functools.lru_cache(maxsize=1024)
+def extract_variables(template: str) -> frozenset[str]:
+    """Extract all {{variable}} references from template string.
+
+    Cached per template, since recipes often repeat prompt and context snippets;
+    the result is a frozenset so cached values cannot be modified by callers.
+    """
+    return frozenset(_TEMPLATE_VARIABLE.findall(template))
 
 
 def check_agent_availability(recipe: Recipe, coordinator: Any) -> list[str]:
@@ -187,27 +197,28 @@ def check_step_dependencies(recipe: Recipe) -> list[str]:
     """Check step dependencies are valid and acyclic."""
     errors = []
 
-    step_ids = {step.id for step in recipe.steps}
+    # Index of the first step with each ID, built once instead of scanned per dependency
+    step_indices: dict[str, int] = {}
+    for i, step in enumerate(recipe.steps):
+        step_indices.setdefault(step.id, i)
 
     # Check each step's dependencies
     for i, step in enumerate(recipe.steps):
         for dep_id in step.depends_on:
             # Check dependency exists
-            if dep_id not in step_ids:
+            dep_index = step_indices.get(dep_id)
+            if dep_index is None:
                 errors.append(f"Step '{step.id}': depends_on references unknown step '{dep_id}'")
                 continue
 
             # Check dependency appears before this step
-            dep_step = recipe.get_step(dep_id)
-            if dep_step:
-                dep_index = recipe.steps.index(dep_step)
-                if dep_index >= i:
-                    errors.append(
-                        f"Step '{step.id}': depends_on '{dep_id}' but '{dep_id}' "
-                        f"appears later in recipe (index {dep_index} >= {i})"
-                    )
+            if dep_index >= i:
+                errors.append(
+                    f"Step '{step.id}': depends_on '{dep_id}' but '{dep_id}' "
+                    f"appears later in recipe (index {dep_index} >= {i})"
+                )
 
-        # Check for circular dependencies (simplified check)
+        # Self-dependencies; longer cycles are reported by Recipe.validate
         if step.id in step.depends_on:
             errors.append(f"Step '{step.id}': cannot depend on itself")
 
@@ -10,6 +10,7 @@ Tests cover:
 
 import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from amplifier_module_tool_recipes.executor import ApprovalGatePausedError
@@ -19,6 +20,7 @@ from amplifier_module_tool_recipes.models import Stage
 from amplifier_module_tool_recipes.models import Step
 from amplifier_module_tool_recipes.session import ApprovalStatus
 from amplifier_module_tool_recipes.session import SessionManager
+from amplifier_module_tool_recipes.session import _read_state
 
 # =============================================================================
 # ApprovalConfig Model Tests
@@ -440,6 +442,25 @@ class TestSessionManagerApprovals:
         assert state["approval_history"][0]["reason"] == "Needs revision"
         assert "timestamp" in state["approval_history"][0]
 
+    def test_set_multiple_approval_statuses(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Batch status update should apply all updates in order."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+
+        session_manager.set_stage_approval_statuses(
+            session_id,
+            temp_dir,
+            [
+                ("planning", ApprovalStatus.APPROVED, "Looks good"),
+                ("review", ApprovalStatus.DENIED, "Needs revision"),
+            ],
+        )
+
+        state = session_manager.load_state(session_id, temp_dir)
+        assert state["stage_approvals"] == {"planning": "approved", "review": "denied"}
+        assert [entry["stage"] for entry in state["approval_history"]] == ["planning", "review"]
+
     def test_set_pending_approval(self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path):
         """Should be able to set pending approval."""
         session_id = session_manager.create_session(sample_recipe, temp_dir)
@@ -464,6 +485,39 @@ class TestSessionManagerApprovals:
         pending = session_manager.get_pending_approval(session_id, temp_dir)
         assert pending is None
 
+    def test_load_pending_approval_returns_state(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """load_pending_approval should return state and pending info from one read."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        session_manager.set_pending_approval(session_id, temp_dir, "planning", "Approve?", 600, "deny")
+
+        state, pending = session_manager.load_pending_approval(session_id, temp_dir)
+
+        assert state["session_id"] == session_id
+        assert pending is not None
+        assert pending["stage_name"] == "planning"
+
+    def test_load_pending_approval_missing_session(self, session_manager: SessionManager, temp_dir: Path):
+        """load_pending_approval should raise for unknown sessions."""
+        with pytest.raises(FileNotFoundError):
+            session_manager.load_pending_approval("missing", temp_dir)
+
+    def test_apply_stage_approvals_can_clear_pending(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """apply_stage_approvals should set status and clear pending in one save."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        session_manager.set_pending_approval(session_id, temp_dir, "planning", "Approve?", 600, "deny")
+        state, _ = session_manager.load_pending_approval(session_id, temp_dir)
+
+        session_manager.apply_stage_approvals(
+            session_id, temp_dir, state, [("planning", ApprovalStatus.DENIED, "No")], clear_pending=True
+        )
+
+        assert session_manager.get_pending_approval(session_id, temp_dir) is None
+        assert session_manager.get_stage_approval_status(session_id, temp_dir, "planning") == ApprovalStatus.DENIED
+
     def test_clear_pending_approval(self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path):
         """clear_pending_approval should remove pending approval data."""
         session_id = session_manager.create_session(sample_recipe, temp_dir)
@@ -500,6 +554,21 @@ class TestSessionManagerApprovals:
         assert len(pending) == 1
         assert pending[0]["session_id"] == session1
 
+    def test_list_pending_approvals_reads_each_session_once(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Each session's state should be parsed once, not once for listing and again for approval info."""
+        first = session_manager.create_session(sample_recipe, temp_dir)
+        second = session_manager.create_session(sample_recipe, temp_dir)
+        session_manager.set_pending_approval(first, temp_dir, "planning", "Approve?", 0, "deny")
+        session_manager.set_pending_approval(second, temp_dir, "review", "Approve?", 0, "deny")
+
+        with patch("amplifier_module_tool_recipes.session._read_state", wraps=_read_state) as read_state:
+            pending = session_manager.list_pending_approvals(temp_dir)
+
+        assert read_state.call_count == 2
+        assert {p["session_id"] for p in pending} == {first, second}
+
     def test_list_pending_approvals_empty(self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path):
         """list_pending_approvals should return empty list when no pending."""
         session_manager.create_session(sample_recipe, temp_dir)
@@ -578,12 +647,16 @@ class TestApprovalTimeout:
         state["pending_approval_requested_at"] = (datetime.datetime.now() - datetime.timedelta(seconds=10)).isoformat()
         session_manager.save_state(session_id, temp_dir, state)
 
-        result = session_manager.check_approval_timeout(session_id, temp_dir)
+        with patch.object(session_manager, "save_state", wraps=session_manager.save_state) as save_state:
+            result = session_manager.check_approval_timeout(session_id, temp_dir)
         assert result == ApprovalStatus.APPROVED
+        # Status, history and pending-clear land in a single write
+        save_state.assert_called_once()
 
-        # Verify status was set
+        # Verify status was set and pending cleared
         status = session_manager.get_stage_approval_status(session_id, temp_dir, "planning")
         assert status == ApprovalStatus.APPROVED
+        assert session_manager.get_pending_approval(session_id, temp_dir) is None
 
     def test_check_timeout_zero_never_expires(
         self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
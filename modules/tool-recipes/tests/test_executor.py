@@ -1,7 +1,14 @@
-"""Tests for recipe executor - variable substitution."""
+"""Tests for recipe executor - variable substitution and retries."""
+
+from collections import ChainMap
+from unittest.mock import AsyncMock
+from unittest.mock import patch
 
 import pytest
 from amplifier_module_tool_recipes.executor import RecipeExecutor
+from amplifier_module_tool_recipes.executor import RetryPlan
+from amplifier_module_tool_recipes.executor import _compile_template
+from amplifier_module_tool_recipes.models import Step
 
 
 class MockSessionManager:
@@ -49,6 +56,12 @@ class TestSubstituteVariables:
         result = executor.substitute_variables(template, context)
         assert result == "Recipe: test-recipe, Version: 1.0.0"
 
+    def test_substitute_through_loop_overlay(self, executor: RecipeExecutor):
+        """Parallel foreach iterations pass a ChainMap overlay; nested lookups resolve through it."""
+        context = ChainMap({"item": "a.py"}, {"recipe": {"name": "test-recipe"}})
+        result = executor.substitute_variables("{{recipe.name}}: {{item}}", context)
+        assert result == "test-recipe: a.py"
+
     def test_substitute_deep_nested_variable(self, executor: RecipeExecutor):
         """Deeper nested variable reference."""
         template = "Session ID: {{session.id}}"
@@ -63,6 +76,11 @@ class TestSubstituteVariables:
         result = executor.substitute_variables(template, context)
         assert result == "No variables here"
 
+    def test_substitute_plain_string_returned_as_is(self, executor: RecipeExecutor):
+        """Strings without {{ should be returned without copying."""
+        template = "".join(["plain ", "value"])
+        assert executor.substitute_variables(template, {}) is template
+
     def test_substitute_undefined_variable_raises(self, executor: RecipeExecutor):
         """Undefined variable should raise ValueError."""
         template = "Hello {{undefined}}"
@@ -151,3 +169,49 @@ Line 3: c"""
         assert "Available variables" in error_msg
         # Should list both available variables
         assert "name" in error_msg or "greeting" in error_msg
+
+
+class TestCompileTemplate:
+    """Tests for cached template parsing."""
+
+    def test_segments_literals_and_variables(self):
+        """Template should split into (literal, variable) pairs with trailing literal."""
+        assert _compile_template("Hi {{name}}, see {{recipe.name}}!") == (
+            ("Hi ", "name"),
+            (", see ", "recipe.name"),
+            ("!", None),
+        )
+
+    def test_template_without_variables(self):
+        """Template without variables should be a single literal segment."""
+        assert _compile_template("plain") == (("plain", None),)
+
+    def test_same_template_parsed_once(self):
+        """Repeated templates should reuse the cached parse."""
+        template = "Cached {{value}} template"
+        assert _compile_template(template) is _compile_template(template)
+
+
+class TestRetryPlan:
+    """Tests for resolved retry settings."""
+
+    def test_defaults_without_retry_config(self):
+        """Steps without retry config get a single attempt."""
+        plan = RetryPlan.from_step(Step(id="s", agent="a", prompt="p"))
+        assert plan == RetryPlan(max_attempts=1, backoff="exponential", initial_delay=5, max_delay=300)
+
+    def test_overrides_from_retry_config(self):
+        """Configured keys override defaults; missing keys keep them."""
+        step = Step(id="s", agent="a", prompt="p", retry={"max_attempts": 3, "backoff": "linear"})
+        assert RetryPlan.from_step(step) == RetryPlan(max_attempts=3, backoff="linear")
+
+    async def test_execute_with_plan_retries(self):
+        """Supplied plan controls attempts instead of the step's retry config."""
+        executor = RecipeExecutor(MockCoordinator(), MockSessionManager())  # type: ignore[arg-type]
+        step = Step(id="s", agent="a", prompt="p")
+        plan = RetryPlan(max_attempts=2, initial_delay=0)
+
+        with patch.object(executor, "execute_step", AsyncMock(side_effect=[RuntimeError("flaky"), "ok"])) as run:
+            assert await executor.execute_step_with_retry(step, {}, plan) == "ok"
+
+        assert run.call_count == 2
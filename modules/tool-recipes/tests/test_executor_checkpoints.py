@@ -0,0 +1,279 @@
+"""Tests for executor checkpointing and staged execution persistence."""
+
+import asyncio
+import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from amplifier_module_tool_recipes.executor import ApprovalGatePausedError
+from amplifier_module_tool_recipes.executor import CheckpointBatcher
+from amplifier_module_tool_recipes.executor import RecipeExecutor
+from amplifier_module_tool_recipes.models import ApprovalConfig
+from amplifier_module_tool_recipes.models import Recipe
+from amplifier_module_tool_recipes.models import Stage
+from amplifier_module_tool_recipes.models import Step
+from amplifier_module_tool_recipes.session import ApprovalStatus
+
+# Note: amplifier_app_cli mocking handled in conftest.py to ensure proper cleanup
+
+
+@pytest.fixture
+def mock_coordinator():
+    """Create a mock coordinator."""
+    coordinator = MagicMock()
+    coordinator.session = MagicMock()
+    coordinator.config = {"agents": {}}
+    return coordinator
+
+
+class TestCheckpointBatcher:
+    """Tests for CheckpointBatcher coalescing."""
+
+    async def test_coalesces_until_flush(self):
+        """Checkpoints below the batch size are held until flush, last write wins."""
+        manager = MagicMock()
+        batcher = CheckpointBatcher(manager, "sid", Path("/project"), max_batch=8, max_interval_s=60)
+
+        batcher.enqueue({"current_step_index": 1, "context": {}})
+        batcher.enqueue({"current_step_index": 2, "context": {}})
+        assert manager.save_state.call_count == 0
+
+        batcher.flush()
+        manager.save_state.assert_called_once_with("sid", Path("/project"), {"current_step_index": 2, "context": {}})
+
+    async def test_writes_when_batch_full(self):
+        """Reaching max_batch writes immediately."""
+        manager = MagicMock()
+        batcher = CheckpointBatcher(manager, "sid", Path("/project"), max_batch=2, max_interval_s=60)
+
+        batcher.enqueue({"current_step_index": 1, "context": {}})
+        batcher.enqueue({"current_step_index": 2, "context": {}})
+
+        manager.save_state.assert_called_once_with("sid", Path("/project"), {"current_step_index": 2, "context": {}})
+
+    async def test_timer_flushes_pending_state(self):
+        """Pending state is written after max_interval_s even without further checkpoints."""
+        manager = MagicMock()
+        batcher = CheckpointBatcher(manager, "sid", Path("/project"), max_batch=8, max_interval_s=0.01)
+
+        batcher.enqueue({"current_step_index": 1, "context": {}})
+        await asyncio.sleep(0.05)
+
+        manager.save_state.assert_called_once_with("sid", Path("/project"), {"current_step_index": 1, "context": {}})
+
+    async def test_timer_writes_enqueued_snapshot(self):
+        """Changes made after enqueue (e.g. by the next step) are not written by the timer."""
+        manager = MagicMock()
+        batcher = CheckpointBatcher(manager, "sid", Path("/project"), max_batch=8, max_interval_s=0.01)
+        state = {"current_step_index": 1, "context": {"out": "a"}, "completed_steps": ["s0"]}
+
+        batcher.enqueue(state)
+        state["current_step_index"] = 2
+        state["context"]["item"] = "mid-loop"
+        state["completed_steps"].append("s1")
+        await asyncio.sleep(0.05)
+
+        manager.save_state.assert_called_once_with(
+            "sid", Path("/project"), {"current_step_index": 1, "context": {"out": "a"}, "completed_steps": ["s0"]}
+        )
+
+    async def test_flush_without_pending_is_noop(self):
+        """Flushing with nothing pending does not write."""
+        manager = MagicMock()
+        batcher = CheckpointBatcher(manager, "sid", Path("/project"))
+
+        batcher.flush()
+
+        assert manager.save_state.call_count == 0
+
+
+class TestExecutorPersistence:
+    """Tests for state persisted by the executor with a real SessionManager."""
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_flat_recipe_final_state(self, mock_spawn, mock_coordinator, session_manager, temp_dir):
+        """Completed flat recipe should leave final state on disk."""
+        mock_spawn.side_effect = AsyncMock(side_effect=["one", "two", "three"])
+        executor = RecipeExecutor(mock_coordinator, session_manager)
+        recipe = Recipe(
+            name="flat",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id=f"s{i}", agent="a", prompt="p", output=f"out{i}") for i in range(3)],
+        )
+
+        result = await executor.execute_recipe(recipe, {}, temp_dir)
+
+        state = session_manager.load_state(result["session"]["id"], temp_dir)
+        assert state["current_step_index"] == 3
+        assert state["completed_steps"] == ["s0", "s1", "s2"]
+        assert state["context"]["out2"] == "three"
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_timer_checkpoint_during_step_is_consistent(
+        self, mock_spawn, mock_coordinator, session_manager, temp_dir
+    ):
+        """A deferred write while the next loop runs records the previous step boundary."""
+        seen: list[dict] = []
+
+        async def spawn(**kwargs):
+            if kwargs["instruction"] == "Process b":
+                await asyncio.sleep(0.05)
+                (session,) = session_manager.list_sessions(temp_dir)
+                seen.append(session_manager.load_state(session["session_id"], temp_dir))
+            return kwargs["instruction"]
+
+        mock_spawn.side_effect = spawn
+        executor = RecipeExecutor(mock_coordinator, session_manager, checkpoint_max_seconds=0.01)
+        recipe = Recipe(
+            name="flat",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(id="s0", agent="a", prompt="p", output="out"),
+                Step(id="loop", agent="a", prompt="Process {{item}}", foreach="{{items}}", collect="results"),
+            ],
+            context={"items": ["a", "b"]},
+        )
+
+        await executor.execute_recipe(recipe, {}, temp_dir)
+
+        state = seen[0]
+        assert state["current_step_index"] == 1
+        assert state["context"]["step"] == {"id": "s0", "index": 0}
+        assert "item" not in state["context"]
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_flat_recipe_failure_saves_progress(self, mock_spawn, mock_coordinator, session_manager, temp_dir):
+        """Failure mid-recipe should persist progress up to the failed step."""
+        mock_spawn.side_effect = AsyncMock(side_effect=["one", RuntimeError("boom")])
+        executor = RecipeExecutor(mock_coordinator, session_manager)
+        recipe = Recipe(
+            name="flat",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id=f"s{i}", agent="a", prompt="p", output=f"out{i}") for i in range(3)],
+        )
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await executor.execute_recipe(recipe, {}, temp_dir)
+
+        sessions = session_manager.list_sessions(temp_dir)
+        assert len(sessions) == 1
+        state = session_manager.load_state(sessions[0]["session_id"], temp_dir)
+        assert state["current_step_index"] == 1
+        assert state["context"]["out0"] == "one"
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_staged_recipe_pauses_and_resumes(self, mock_spawn, mock_coordinator, session_manager, temp_dir):
+        """Staged recipe should persist progress at approval gate and resume after approval."""
+        mock_spawn.side_effect = AsyncMock(side_effect=["plan", "build"])
+        executor = RecipeExecutor(mock_coordinator, session_manager)
+        recipe = Recipe(
+            name="staged",
+            description="test",
+            version="1.0.0",
+            stages=[
+                Stage(
+                    name="planning",
+                    steps=[Step(id="plan", agent="a", prompt="p", output="plan_out")],
+                    approval=ApprovalConfig(required=True, prompt="Approve plan?"),
+                ),
+                Stage(
+                    name="building",
+                    steps=[Step(id="build", agent="a", prompt="{{plan_out}}", output="build_out")],
+                ),
+            ],
+        )
+
+        with pytest.raises(ApprovalGatePausedError) as exc_info:
+            await executor.execute_recipe(recipe, {}, temp_dir)
+
+        session_id = exc_info.value.session_id
+        state = session_manager.load_state(session_id, temp_dir)
+        assert state["current_stage_index"] == 1
+        assert state["completed_stages"] == ["planning"]
+        assert state["pending_approval_stage"] == "planning"
+
+        session_manager.set_stage_approval_status(session_id, temp_dir, "planning", ApprovalStatus.APPROVED)
+        result = await executor.execute_recipe(recipe, {}, temp_dir, session_id=session_id)
+
+        assert result["build_out"] == "build"
+        state = session_manager.load_state(session_id, temp_dir)
+        assert state["completed_stages"] == ["planning", "building"]
+        assert state["completed_steps"] == ["plan", "build"]
+        assert "pending_approval_stage" not in state
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_cleanup_runs_in_background(self, mock_spawn, mock_coordinator, session_manager, temp_dir):
+        """Old sessions should be pruned by a background task after the recipe returns."""
+        mock_spawn.side_effect = AsyncMock(return_value="done")
+        recipe = Recipe(
+            name="flat",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id="s0", agent="a", prompt="p", output="out")],
+        )
+        old_session = session_manager.create_session(recipe, temp_dir)
+        state = session_manager.load_state(old_session, temp_dir)
+        state["started"] = (datetime.datetime.now() - datetime.timedelta(days=30)).isoformat()
+        session_manager.save_state(old_session, temp_dir, state)
+
+        executor = RecipeExecutor(mock_coordinator, session_manager)
+        await executor.execute_recipe(recipe, {}, temp_dir)
+
+        assert executor._background_tasks
+        await asyncio.gather(*executor._background_tasks)
+        assert not session_manager.session_exists(old_session, temp_dir)
+        assert not executor._background_tasks
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_cleanup_runs_once_at_a_time(self, mock_spawn, mock_coordinator, temp_dir):
+        """Runs finishing while a cleanup is in flight do not start another."""
+        mock_spawn.side_effect = AsyncMock(return_value="done")
+        manager = MagicMock()
+        manager.create_session.return_value = "sid"
+        recipe = Recipe(
+            name="flat",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id="s0", agent="a", prompt="p", output="out")],
+        )
+
+        executor = RecipeExecutor(mock_coordinator, manager)
+        await asyncio.gather(*(executor.execute_recipe(recipe, {}, temp_dir) for _ in range(3)))
+        await asyncio.gather(*executor._background_tasks)
+
+        manager.cleanup_old_sessions.assert_called_once_with(temp_dir)
+
+    @pytest.mark.asyncio
+    # One write from create_session, then one per batch of completed steps
+    @pytest.mark.parametrize(("interval", "expected_writes"), [(1, 4), (8, 2)])
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_checkpoint_interval(
+        self, mock_spawn, interval, expected_writes, mock_coordinator, session_manager, temp_dir
+    ):
+        """checkpoint_interval controls how many completed steps share one write."""
+        mock_spawn.side_effect = AsyncMock(return_value="done")
+        executor = RecipeExecutor(mock_coordinator, session_manager, checkpoint_interval=interval)
+        recipe = Recipe(
+            name="flat",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id=f"s{i}", agent="a", prompt="p", output=f"out{i}") for i in range(3)],
+        )
+
+        with patch.object(session_manager, "save_state", wraps=session_manager.save_state) as save_state:
+            result = await executor.execute_recipe(recipe, {}, temp_dir)
+
+        assert save_state.call_count == expected_writes
+        assert session_manager.load_state(result["session"]["id"], temp_dir)["current_step_index"] == 3
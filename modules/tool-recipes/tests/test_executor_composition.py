@@ -9,6 +9,7 @@ from amplifier_module_tool_recipes.executor import RecipeExecutor
 from amplifier_module_tool_recipes.executor import RecursionState
 from amplifier_module_tool_recipes.models import Recipe
 from amplifier_module_tool_recipes.models import RecursionConfig
+from amplifier_module_tool_recipes.models import load_recipe
 from amplifier_module_tool_recipes.models import Step
 
 
@@ -255,6 +256,60 @@ steps:
         assert result["all_outputs"]["out2"] == "res2"
         assert result["all_outputs"]["out3"] == "res3"
 
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_sub_recipe_run_skips_session_cleanup(
+        self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir
+    ):
+        """Only the top-level run schedules old-session cleanup."""
+        mock_spawn.side_effect = AsyncMock(return_value="done")
+        recipe = Recipe(
+            name="sub-recipe",
+            description="Sub recipe",
+            version="1.0.0",
+            steps=[Step(id="step1", agent="test-agent", prompt="Process", output="result")],
+        )
+
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+        await executor.execute_recipe(
+            recipe, {}, temp_dir, recursion_state=RecursionState(current_depth=1, recipe_stack=["parent"])
+        )
+
+        assert not executor._background_tasks
+        mock_session_manager.cleanup_old_sessions.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_cached_recipe_context_not_shared_with_runs(
+        self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir
+    ):
+        """Nested context defaults are copied per run, so edits never reach the cached recipe."""
+        mock_spawn.side_effect = AsyncMock(return_value="done")
+        recipe_path = create_sub_recipe_file(
+            temp_dir,
+            "defaults",
+            """
+name: defaults
+description: Recipe with nested context defaults
+version: "1.0.0"
+
+context:
+  files: ["a.py"]
+
+steps:
+  - id: step1
+    agent: test-agent
+    prompt: "Process {{files}}"
+    output: result
+""",
+        )
+
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+        result = await executor.execute_recipe(load_recipe(recipe_path), {}, temp_dir)
+        result["files"].append("b.py")
+
+        assert load_recipe(recipe_path).context["files"] == ["a.py"]
+
 
 class TestRecursionLimits:
     """Tests for recursion protection."""
@@ -504,6 +559,62 @@ steps:
         assert "all_results" in result
         assert len(result["all_results"]) == 3
 
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_sub_recipe_parsed_once_per_loop(self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir):
+        """An unchanged sub-recipe file is parsed once, not once per iteration."""
+        sub_recipe_yaml = """
+name: echo-item
+description: Echo single item
+version: "1.0.0"
+
+steps:
+  - id: echo
+    agent: a
+    prompt: "Echo {{item}}"
+"""
+        create_sub_recipe_file(temp_dir, "echo-item", sub_recipe_yaml)
+
+        parent_recipe = Recipe(
+            name="parent",
+            description="Parent",
+            version="1.0.0",
+            steps=[
+                Step(
+                    id="echo-all",
+                    type="recipe",
+                    recipe="echo-item.yaml",
+                    step_context={"item": "{{current_item}}"},
+                    foreach="{{items}}",
+                    as_var="current_item",
+                ),
+            ],
+            context={"items": ["a", "b", "c"]},
+        )
+
+        mock_spawn.side_effect = AsyncMock(return_value="ok")
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+        with patch.object(Recipe, "from_yaml", wraps=Recipe.from_yaml) as from_yaml:
+            await executor.execute_recipe(parent_recipe, {}, temp_dir)
+
+        assert mock_spawn.call_count == 3
+        assert from_yaml.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_missing_sub_recipe_raises(self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir):
+        """Missing sub-recipe file raises with the resolved path."""
+        parent_recipe = Recipe(
+            name="parent",
+            description="Parent",
+            version="1.0.0",
+            steps=[Step(id="call", type="recipe", recipe="missing.yaml")],
+        )
+
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+        with pytest.raises(FileNotFoundError, match="Sub-recipe not found"):
+            await executor.execute_recipe(parent_recipe, {}, temp_dir)
+
     @pytest.mark.asyncio
     @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
     async def test_composition_with_condition(self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir):
@@ -646,6 +757,15 @@ class TestRecursionState:
         with pytest.raises(ValueError, match="Total steps.*exceeds limit"):
             state.increment_steps()  # 100, fails because 100 >= 100
 
+    def test_increment_steps_n(self):
+        """increment_steps_n adds the whole batch and checks limit once."""
+        state = RecursionState(total_steps=5, max_total_steps=100)
+        state.increment_steps_n(10)
+        assert state.total_steps == 15
+
+        with pytest.raises(ValueError, match="Total steps.*exceeds limit"):
+            state.increment_steps_n(85)
+
     def test_enter_recipe_creates_child_state(self):
         """enter_recipe creates proper child state."""
         parent = RecursionState(
@@ -1,11 +1,13 @@
 """Tests for executor loop (foreach) functionality."""
 
+import asyncio
 from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 from amplifier_module_tool_recipes.executor import RecipeExecutor
+from amplifier_module_tool_recipes.executor import _foreach_path
 from amplifier_module_tool_recipes.models import Recipe
 from amplifier_module_tool_recipes.models import Step
 
@@ -372,6 +374,18 @@ class TestLoopValidation:
         errors = step.validate()
         assert any("foreach must contain a variable reference" in e for e in errors)
 
+    def test_foreach_malformed_reference_rejected(self):
+        """Unclosed or non-identifier references fail validation, as they would at runtime."""
+        for foreach in ("{{items", "{{}}", "{{bad-name}}"):
+            step = Step(id="test", agent="a", prompt="p", foreach=foreach)
+            errors = step.validate()
+            assert any("foreach must contain a variable reference" in e for e in errors), foreach
+
+    def test_foreach_dotted_reference_accepted(self):
+        """A dotted path reference with surrounding whitespace is valid."""
+        step = Step(id="test", agent="a", prompt="p", foreach=" {{outputs.files}} ")
+        assert not any("foreach" in e for e in step.validate())
+
     def test_as_must_be_valid_variable_name(self):
         """as must be alphanumeric with underscores."""
         step = Step(
@@ -446,6 +460,31 @@ class TestLoopValidation:
         errors = step.validate()
         assert not errors
 
+    def test_max_concurrency_must_be_positive(self):
+        """max_concurrency must be a positive integer."""
+        step = Step(
+            id="test",
+            agent="a",
+            prompt="p",
+            foreach="{{items}}",
+            parallel=True,
+            max_concurrency=0,
+        )
+        errors = step.validate()
+        assert any("max_concurrency must be positive integer" in e for e in errors)
+
+    def test_max_concurrency_rejects_bool(self):
+        """A YAML boolean is not a concurrency limit."""
+        step = Step(id="test", agent="a", prompt="p", foreach="{{items}}", parallel=True, max_concurrency=True)
+        errors = step.validate()
+        assert any("max_concurrency must be positive integer" in e for e in errors)
+
+    def test_max_concurrency_requires_parallel(self):
+        """max_concurrency on a sequential foreach would be silently ignored."""
+        step = Step(id="test", agent="a", prompt="p", foreach="{{items}}", max_concurrency=4)
+        errors = step.validate()
+        assert any("max_concurrency requires parallel" in e for e in errors)
+
 
 class TestParallelExecution:
     """Tests for parallel foreach execution."""
@@ -669,3 +708,229 @@ class TestParallelExecution:
         assert seq_call_count == par_call_count == 3
         # Same results structure
         assert seq_result["results"] == par_result["results"]
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_parallel_foreach_respects_max_concurrency(
+        self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir
+    ):
+        """No more than max_concurrency iterations run at once."""
+        running = 0
+        peak = 0
+
+        async def spawn(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return kwargs["instruction"]
+
+        mock_spawn.side_effect = spawn
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(
+                    id="parallel-loop",
+                    agent="a",
+                    prompt="Process {{item}}",
+                    foreach="{{items}}",
+                    parallel=True,
+                    max_concurrency=2,
+                    collect="results",
+                ),
+            ],
+            context={"items": list(range(6))},
+        )
+
+        result = await executor.execute_recipe(recipe, {}, temp_dir)
+
+        assert peak == 2
+        assert result["results"] == [f"Process {i}" for i in range(6)]
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_parallel_foreach_unbounded_by_default(
+        self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir
+    ):
+        """Without max_concurrency every iteration starts at once."""
+        running = 0
+        peak = 0
+
+        async def spawn(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return kwargs["instruction"]
+
+        mock_spawn.side_effect = spawn
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(
+                    id="parallel-loop",
+                    agent="a",
+                    prompt="Process {{item}}",
+                    foreach="{{items}}",
+                    parallel=True,
+                    collect="results",
+                ),
+            ],
+            context={"items": list(range(20))},
+        )
+
+        result = await executor.execute_recipe(recipe, {}, temp_dir)
+
+        assert peak == 20
+        assert result["results"] == [f"Process {i}" for i in range(20)]
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_parallel_foreach_failure_cancels_pending(
+        self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir
+    ):
+        """First failing iteration cancels iterations still in flight."""
+        cancelled = []
+
+        async def spawn(**kwargs):
+            if kwargs["instruction"] == "Process bad":
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(kwargs["instruction"])
+                raise
+            return "done"
+
+        mock_spawn.side_effect = spawn
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(
+                    id="parallel-loop",
+                    agent="a",
+                    prompt="Process {{item}}",
+                    foreach="{{items}}",
+                    parallel=True,
+                    collect="results",
+                ),
+            ],
+            context={"items": ["slow", "bad"]},
+        )
+
+        with pytest.raises(ValueError, match="iteration 1 failed"):
+            await asyncio.wait_for(executor.execute_recipe(recipe, {}, temp_dir), timeout=5)
+
+        assert cancelled == ["Process slow"]
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_parallel_foreach_nested_context_reference(
+        self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir
+    ):
+        """Dotted references resolve through the per-iteration overlay."""
+        mock_spawn.side_effect = AsyncMock(side_effect=["r1", "r2"])
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+
+        recipe = Recipe(
+            name="overlay-test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(
+                    id="parallel-loop",
+                    agent="a",
+                    prompt="{{recipe.name}}: {{item}}",
+                    foreach="{{items}}",
+                    parallel=True,
+                    collect="results",
+                ),
+            ],
+            context={"items": ["a", "b"]},
+        )
+
+        result = await executor.execute_recipe(recipe, {}, temp_dir)
+
+        instructions = sorted(call.kwargs["instruction"] for call in mock_spawn.call_args_list)
+        assert instructions == ["overlay-test: a", "overlay-test: b"]
+        assert "item" not in result
+
+
+class TestForeachPath:
+    """Tests for cached foreach reference parsing."""
+
+    def test_dotted_path_parsed_once(self):
+        """Dotted references split into parts and are cached per string."""
+        assert _foreach_path(" {{outputs.files}} ") == ("outputs", "files")
+        assert _foreach_path("{{outputs.files}}") is _foreach_path("{{outputs.files}}")
+
+    def test_invalid_syntax_raises(self):
+        """Foreach without a variable reference is rejected."""
+        with pytest.raises(ValueError, match="Invalid foreach syntax"):
+            _foreach_path("files")
+
+
+class TestParallelFailures:
+    """Tests for how parallel iteration failures surface."""
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_failure_keeps_original_cause(self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir):
+        """Failing iteration raises a plain ValueError chained to the agent error."""
+        mock_spawn.side_effect = AsyncMock(side_effect=RuntimeError("agent down"))
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id="loop", agent="a", prompt="{{item}}", foreach="{{items}}", parallel=True)],
+            context={"items": ["a"]},
+        )
+
+        with pytest.raises(ValueError, match="iteration 0 failed") as exc_info:
+            await executor.execute_recipe(recipe, {}, temp_dir)
+
+        assert isinstance(exc_info.value.__cause__, RuntimeError)
+
+    @pytest.mark.asyncio
+    @patch("amplifier_app_cli.session_spawner.spawn_sub_session")
+    async def test_skip_remaining_propagates(self, mock_spawn, mock_coordinator, mock_session_manager, temp_dir):
+        """on_error='skip_remaining' in a parallel loop skips the following steps."""
+        mock_spawn.side_effect = AsyncMock(side_effect=RuntimeError("agent down"))
+        executor = RecipeExecutor(mock_coordinator, mock_session_manager)
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(
+                    id="loop",
+                    agent="a",
+                    prompt="{{item}}",
+                    foreach="{{items}}",
+                    parallel=True,
+                    on_error="skip_remaining",
+                ),
+                Step(id="after", agent="a", prompt="never", output="after_out"),
+            ],
+            context={"items": ["a", "b"]},
+        )
+
+        result = await executor.execute_recipe(recipe, {}, temp_dir)
+
+        assert "after_out" not in result
+        assert mock_spawn.call_count == 2
@@ -1,7 +1,12 @@
 """Tests for expression evaluator - condition parsing and evaluation."""
 
+from unittest.mock import patch
+
 import pytest
 from amplifier_module_tool_recipes.expression_evaluator import ExpressionError
+from amplifier_module_tool_recipes.expression_evaluator import _Const
+from amplifier_module_tool_recipes.expression_evaluator import _compile_expression
+from amplifier_module_tool_recipes.expression_evaluator import compile_condition
 from amplifier_module_tool_recipes.expression_evaluator import evaluate_condition
 
 
@@ -164,6 +169,96 @@ class TestEdgeCases:
         assert evaluate_condition("{{count}} == '42'", ctx) is True
 
 
+class TestCompiledStructure:
+    """Tests that parsing depends on the expression, not on variable values."""
+
+    def test_value_containing_boolean_keyword(self):
+        """Values containing ' and ' / ' or ' compare as whole strings."""
+        ctx = {"title": "salt and pepper", "same": "salt and pepper"}
+        assert evaluate_condition("{{title}} != 'plain'", ctx) is True
+        assert evaluate_condition("{{title}} == {{same}}", ctx) is True
+        ctx = {"title": "this or that"}
+        assert evaluate_condition("{{title}} == 'this'", ctx) is False
+
+    def test_value_containing_and_no_longer_splits_condition(self):
+        """Behaviour change: substituting first split this value and raised a syntax error."""
+        assert evaluate_condition("{{title}} == 'y'", {"title": "x and y"}) is False
+        assert evaluate_condition("{{title}} != 'y'", {"title": "x and y"}) is True
+
+    def test_value_containing_operator(self):
+        """Values containing == compare as whole strings."""
+        ctx = {"code": "a == b"}
+        assert evaluate_condition("{{code}} != 'a'", ctx) is True
+
+    def test_undefined_variable_in_skipped_branch_raises(self):
+        """Every referenced variable must be defined, even past a short-circuit."""
+        with pytest.raises(ExpressionError, match="Undefined variable: missing"):
+            evaluate_condition("{{a}} == 'x' or {{missing}} == 'y'", {"a": "x"})
+
+    def test_variable_operands_compare_values(self):
+        """Whole-variable operands compare their values without re-parsing text."""
+        ctx = {"a": 'it\'s "quoted"', "b": 'it\'s "quoted"', "flag": True}
+        with patch("amplifier_module_tool_recipes.expression_evaluator._parse_value") as parse:
+            assert evaluate_condition("{{a}} == {{b}}", ctx) is True
+            assert evaluate_condition("{{flag}} != {{a}}", ctx) is True
+
+        parse.assert_not_called()
+
+    def test_bare_boolean_variable(self):
+        """A lone boolean variable is its own condition."""
+        assert evaluate_condition("{{flag}}", {"flag": True}) is True
+        assert evaluate_condition("{{flag}}", {"flag": False}) is False
+
+
+class TestCaching:
+    """Tests for cached expression parsing and evaluation."""
+
+    def test_segments_parsed_once(self):
+        """Same expression should reuse its parsed segments."""
+        expression = "{{status}} == 'done' and {{step.id}} != 'x'"
+        assert _compile_expression(expression) is _compile_expression(expression)
+        assert [var for _, var in _compile_expression(expression)] == ["status", "step.id", None]
+
+    def test_cached_expression_sees_new_values(self):
+        """Reusing an expression with different context values evaluates each correctly."""
+        expression = "{{status}} == 'success'"
+        assert evaluate_condition(expression, {"status": "success"}) is True
+        assert evaluate_condition(expression, {"status": "failure"}) is False
+        assert evaluate_condition(expression, {"status": "success"}) is True
+
+    def test_condition_compiled_once(self):
+        """Same expression should reuse its compiled tree."""
+        expression = "{{status}} == 'done' or {{status}} == 'skipped'"
+        assert compile_condition(expression) is compile_condition(expression)
+        assert compile_condition(expression).variables == ("status",)
+
+    def test_constant_condition_skips_lookup(self):
+        """Conditions without variable references never consult the context."""
+        with patch("amplifier_module_tool_recipes.expression_evaluator._resolve_variable") as resolve:
+            assert evaluate_condition("'a' == 'a'", {}) is True
+            assert evaluate_condition("false", {}) is False
+
+        resolve.assert_not_called()
+
+    def test_literal_terms_folded_at_compile_time(self):
+        """Conditions made only of literals compile to their result."""
+        assert compile_condition("true").root == _Const(True)
+        assert compile_condition(" FALSE ").root == _Const(False)
+        assert compile_condition("'a' != 'b'").root == _Const(True)
+        assert compile_condition("'a' == 'b' or true").root.right == _Const(True)
+
+    def test_invalid_literal_term_still_raises(self):
+        """Folding never turns an invalid bare term into a result."""
+        with pytest.raises(ExpressionError, match="Invalid expression"):
+            evaluate_condition("maybe", {})
+
+    def test_errors_not_cached_as_results(self):
+        """Invalid syntax should raise on every evaluation."""
+        for _ in range(2):
+            with pytest.raises(ExpressionError, match="Invalid expression"):
+                evaluate_condition("{{x}} >>> 'value'", {"x": "value"})
+
+
 class TestRecipePatterns:
     """Tests matching common recipe usage patterns."""
 
@@ -1,10 +1,13 @@
 """Tests for recipe models - Recipe, Step, YAML parsing."""
 
+import os
 from pathlib import Path
 
 import pytest
 from amplifier_module_tool_recipes.models import Recipe
+from amplifier_module_tool_recipes.models import Stage
 from amplifier_module_tool_recipes.models import Step
+from amplifier_module_tool_recipes.models import load_recipe
 
 
 class TestStep:
@@ -87,6 +90,20 @@ class TestStep:
         errors = step.validate()
         assert any("backoff" in e.lower() for e in errors)
 
+    def test_step_validation_non_string_choices(self):
+        """Non-string on_error/backoff from YAML should fail validation, not raise."""
+        step = Step(id="test", agent="test", prompt="test", on_error=["fail"], retry={"backoff": ["linear"]})  # type: ignore[arg-type]
+        errors = step.validate()
+        assert any("on_error" in e for e in errors)
+        assert any("backoff" in e for e in errors)
+
+    def test_step_uses_slots(self):
+        """Steps store fields in slots, without a per-instance __dict__."""
+        step = Step(id="test", agent="test", prompt="test")
+        assert not hasattr(step, "__dict__")
+        with pytest.raises(AttributeError):
+            step.undeclared = True  # type: ignore[attr-defined]
+
 
 class TestRecipe:
     """Tests for Recipe dataclass."""
@@ -153,6 +170,21 @@ class TestRecipe:
             errors = recipe.validate()
             assert any("version" in e.lower() for e in errors), f"Version '{version}' should be invalid"
 
+    def test_recipe_validation_version_messages(self):
+        """Each kind of invalid version gets its specific message."""
+        expected = {
+            "v1.0.0": "without 'v' prefix",
+            "1.0.0-beta": "no pre-release tags",
+            "1.0": "(MAJOR.MINOR.PATCH)",
+            "1.a.0": "must be numeric",
+        }
+        for version, message in expected.items():
+            recipe = Recipe(name="test", description="test", version=version, steps=[])
+            assert any(message in e for e in recipe.validate()), version
+
+        recipe = Recipe(name="test", description="test", version="10.20.30", steps=[])
+        assert not any("version" in e.lower() for e in recipe.validate())
+
     def test_recipe_validation_no_steps(self):
         """Recipe with no steps should fail validation."""
         recipe = Recipe(name="test", description="test", version="1.0.0", steps=[])
@@ -173,6 +205,16 @@ class TestRecipe:
         errors = recipe.validate()
         assert any("duplicate" in e.lower() for e in errors)
 
+    def test_recipe_validation_duplicates_listed_once(self):
+        """Each duplicated step ID should be reported once, in first-seen order."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[Step(id=sid, agent="a", prompt="p") for sid in ("b", "a", "b", "a", "b", "c")],
+        )
+        assert "Duplicate step IDs: b, a" in recipe.validate()
+
     def test_recipe_validation_invalid_depends_on(self):
         """Recipe with invalid depends_on reference should fail."""
         recipe = Recipe(
@@ -200,6 +242,65 @@ class TestRecipe:
         errors = recipe.validate()
         assert any("depend on itself" in e.lower() for e in errors)
 
+    def test_recipe_validation_dependency_cycle(self):
+        """Multi-step cycles are reported; steps that only depend on the cycle are not."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(id="a", agent="x", prompt="p", depends_on=["c"]),
+                Step(id="b", agent="x", prompt="p", depends_on=["a"]),
+                Step(id="c", agent="x", prompt="p", depends_on=["b"]),
+                Step(id="d", agent="x", prompt="p", depends_on=["c"]),
+            ],
+        )
+        assert "Circular dependency between steps: a, b, c" in recipe.validate()
+
+    def test_recipe_validation_dependency_between_cycles(self):
+        """A step on a path between two separate cycles is on neither of them."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(id="a", agent="x", prompt="p", depends_on=["b"]),
+                Step(id="b", agent="x", prompt="p", depends_on=["a"]),
+                Step(id="bridge", agent="x", prompt="p", depends_on=["a"]),
+                Step(id="c", agent="x", prompt="p", depends_on=["d", "bridge"]),
+                Step(id="d", agent="x", prompt="p", depends_on=["c"]),
+            ],
+        )
+        assert "Circular dependency between steps: a, b, c, d" in recipe.validate()
+
+    def test_recipe_validation_dependency_cycle_across_stages(self):
+        """Cycles spanning stages are reported in staged mode."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            stages=[
+                Stage(name="one", steps=[Step(id="a", agent="x", prompt="p", depends_on=["b"])]),
+                Stage(name="two", steps=[Step(id="b", agent="x", prompt="p", depends_on=["a"])]),
+            ],
+        )
+        assert "Circular dependency between steps: a, b" in recipe.validate()
+
+    def test_recipe_validation_acyclic_dependencies(self):
+        """A diamond of dependencies is not a cycle."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(id="a", agent="x", prompt="p"),
+                Step(id="b", agent="x", prompt="p", depends_on=["a"]),
+                Step(id="c", agent="x", prompt="p", depends_on=["a"]),
+                Step(id="d", agent="x", prompt="p", depends_on=["b", "c"]),
+            ],
+        )
+        assert not any("Circular" in e for e in recipe.validate())
+
     def test_recipe_get_step(self, multi_step_recipe: Recipe):
         """get_step should return correct step by ID."""
         step = multi_step_recipe.get_step("step-2")
@@ -224,6 +325,17 @@ class TestRecipeFromYaml:
         assert len(recipe.steps) == 2
         assert recipe.context["file_path"] == "/path/to/file"
 
+    def test_from_yaml_non_ascii(self, temp_dir: Path):
+        """UTF-8 content should decode correctly."""
+        recipe_file = temp_dir / "unicode.yaml"
+        recipe_file.write_bytes(
+            "name: café\ndescription: 日本語 ✓\nversion: 1.0.0\n"
+            "steps:\n  - id: s\n    agent: a\n    prompt: p\n".encode()
+        )
+        recipe = Recipe.from_yaml(recipe_file)
+        assert recipe.name == "café"
+        assert recipe.description == "日本語 ✓"
+
     def test_from_yaml_file_not_found(self, temp_dir: Path):
         """Loading nonexistent file should raise FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
@@ -265,3 +377,33 @@ class TestRecipeFromYaml:
         report_step = recipe.get_step("report")
         assert report_step is not None
         assert "analyze" in report_step.depends_on
+
+
+class TestLoadRecipe:
+    """Tests for cached recipe loading."""
+
+    def test_unchanged_file_returns_cached_recipe(self, yaml_recipe_file: Path):
+        """Loading the same unchanged file twice should reuse the parsed recipe."""
+        first = load_recipe(yaml_recipe_file)
+        second = load_recipe(yaml_recipe_file)
+
+        assert first is second
+        assert first.name == "yaml-test-recipe"
+
+    def test_modified_file_is_reparsed(self, yaml_recipe_file: Path, sample_yaml_content: str):
+        """Changing the file should invalidate the cached recipe."""
+        first = load_recipe(yaml_recipe_file)
+
+        yaml_recipe_file.write_text(sample_yaml_content.replace("version: 2.0.0", "version: 2.0.1"))
+        stat = yaml_recipe_file.stat()
+        os.utime(yaml_recipe_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = load_recipe(yaml_recipe_file)
+
+        assert second is not first
+        assert second.version == "2.0.1"
+
+    def test_missing_file_raises(self, temp_dir: Path):
+        """Missing recipe file should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Recipe file not found"):
+            load_recipe(temp_dir / "missing.yaml")
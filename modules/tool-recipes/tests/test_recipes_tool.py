@@ -0,0 +1,296 @@
+"""Tests for RecipesTool helpers in the package entry point."""
+
+import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from amplifier_module_tool_recipes import RecipesTool
+from amplifier_module_tool_recipes import _as_path
+from amplifier_module_tool_recipes.models import Recipe
+from amplifier_module_tool_recipes.session import ApprovalStatus
+from amplifier_module_tool_recipes.session import SessionManager
+from amplifier_module_tool_recipes.validator import ValidationResult
+
+
+@pytest.fixture
+def recipes_tool(session_manager, mock_coordinator) -> RecipesTool:
+    """Create a RecipesTool with mock coordinator and temp session manager."""
+    return RecipesTool(None, session_manager, mock_coordinator, {})  # type: ignore[arg-type]
+
+
+class TestAsPath:
+    """Tests for recipe path normalization."""
+
+    def test_relative_path_joined_to_project(self, temp_dir: Path):
+        """Relative paths should be anchored at the project path."""
+        assert _as_path("recipes/a.yaml", temp_dir) == temp_dir / "recipes" / "a.yaml"
+
+    def test_absolute_path_unchanged(self, temp_dir: Path):
+        """Absolute paths should be returned as-is."""
+        path = temp_dir / "a.yaml"
+        assert _as_path(str(path), Path("/elsewhere")) == path
+
+    def test_user_home_expanded(self, temp_dir: Path):
+        """Leading ~ should expand to the user's home directory."""
+        assert _as_path("~/a.yaml", temp_dir) == Path.home() / "a.yaml"
+
+
+class TestInputSchema:
+    """Tests for the tool input schema."""
+
+    def test_mutation_does_not_leak_between_instances(
+        self, recipes_tool: RecipesTool, session_manager, mock_coordinator
+    ):
+        """Changing one caller's schema should not affect other instances."""
+        schema = recipes_tool.input_schema
+        schema["properties"]["operation"]["enum"].append("bogus")
+        schema["required"].append("recipe_path")
+
+        other = RecipesTool(None, session_manager, mock_coordinator, {})  # type: ignore[arg-type]
+        assert "bogus" not in other.input_schema["properties"]["operation"]["enum"]
+        assert recipes_tool.input_schema["required"] == ["operation"]
+
+    def test_schema_is_json_serializable(self, recipes_tool: RecipesTool):
+        """Hosts serialize the schema for tool listings."""
+        assert json.loads(json.dumps(recipes_tool.input_schema)) == recipes_tool.input_schema
+
+
+class TestValidateCached:
+    """Tests for per-tool validation result caching."""
+
+    def test_same_recipe_reuses_result(self, recipes_tool: RecipesTool, sample_recipe: Recipe):
+        """Validating the same recipe object twice should reuse the result."""
+        first = recipes_tool._validate_cached(sample_recipe)
+        second = recipes_tool._validate_cached(sample_recipe)
+
+        assert first is second
+        assert first.is_valid
+
+    def test_different_recipe_is_validated(self, recipes_tool: RecipesTool, sample_recipe: Recipe):
+        """Equal but distinct recipe objects should not share cached results."""
+        first = recipes_tool._validate_cached(sample_recipe)
+        other = Recipe(
+            name=sample_recipe.name,
+            description=sample_recipe.description,
+            version=sample_recipe.version,
+            steps=sample_recipe.steps,
+            context=sample_recipe.context,
+        )
+
+        assert recipes_tool._validate_cached(other) is not first
+
+    def test_agent_availability_change_revalidates(self, recipes_tool: RecipesTool, sample_recipe: Recipe):
+        """Changing available agents should invalidate the cached result."""
+        first = recipes_tool._validate_cached(sample_recipe)
+        assert not first.warnings
+
+        recipes_tool.coordinator._available_agents = ["other-agent"]
+        second = recipes_tool._validate_cached(sample_recipe)
+
+        assert second is not first
+        assert second.warnings
+
+
+class TestLoadValidated:
+    """Tests for combined recipe load and validation."""
+
+    async def test_unchanged_file_reuses_recipe_and_validation(self, recipes_tool: RecipesTool, yaml_recipe_file: Path):
+        """Second load of an unchanged file should return the cached recipe and result."""
+        recipe, validation = await recipes_tool._load_validated(yaml_recipe_file)
+        cached_recipe, cached_validation = await recipes_tool._load_validated(yaml_recipe_file)
+
+        assert cached_recipe is recipe
+        assert cached_validation is validation
+
+    async def test_validation_runs_on_event_loop_thread(self, recipes_tool: RecipesTool, yaml_recipe_file: Path):
+        """Validation touches the coordinator and the cache, so it must not run in the worker thread."""
+        threads = []
+
+        def record_thread(recipe, coordinator):
+            threads.append(threading.current_thread())
+            return ValidationResult(is_valid=True, errors=[], warnings=[])
+
+        with patch("amplifier_module_tool_recipes.validate_recipe", side_effect=record_thread):
+            await recipes_tool._load_validated(yaml_recipe_file)
+
+        assert threads == [threading.main_thread()]
+
+
+class TestExecuteDispatch:
+    """Tests for operation dispatch in RecipesTool.execute."""
+
+    async def test_unknown_operation(self, recipes_tool: RecipesTool):
+        """Unknown operation should return an error result."""
+        result = await recipes_tool.execute({"operation": "bogus"})
+
+        assert not result.success
+        assert result.error == {"message": "Unknown operation: bogus"}
+
+    async def test_missing_operation(self, recipes_tool: RecipesTool):
+        """Missing operation should return an error result."""
+        result = await recipes_tool.execute({})
+
+        assert not result.success
+        assert result.error == {"message": "Unknown operation: None"}
+
+    async def test_dispatches_to_handler(self, recipes_tool: RecipesTool, yaml_recipe_file: Path):
+        """Known operation should be routed to its handler."""
+        result = await recipes_tool.execute({"operation": "validate", "recipe_path": str(yaml_recipe_file)})
+
+        assert result.success
+        assert result.output["status"] == "valid"
+
+
+class TestApproveBatch:
+    """Tests for the approve_batch operation."""
+
+    def _pending_session(self, session_manager: SessionManager, recipe: Recipe, project_path: Path, stage: str) -> str:
+        session_id = session_manager.create_session(recipe, project_path)
+        session_manager.set_pending_approval(session_id, project_path, stage, "Approve?", 0, "deny")
+        return session_id
+
+    async def test_approves_across_sessions(
+        self, recipes_tool: RecipesTool, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """All matching pending stages should be approved."""
+        first = self._pending_session(session_manager, sample_recipe, temp_dir, "planning")
+        second = self._pending_session(session_manager, sample_recipe, temp_dir, "review")
+
+        result = await recipes_tool._approve_batch(
+            {
+                "approvals": [
+                    {"session_id": first, "stage_name": "planning"},
+                    {"session_id": second, "stage_name": "review"},
+                ]
+            },
+            temp_dir,
+        )
+
+        assert result.success
+        assert result.output["count"] == 2
+        assert session_manager.get_stage_approval_status(first, temp_dir, "planning") == ApprovalStatus.APPROVED
+        assert session_manager.get_stage_approval_status(second, temp_dir, "review") == ApprovalStatus.APPROVED
+
+    async def test_reports_failures(
+        self, recipes_tool: RecipesTool, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Mismatched stages and unknown sessions should be reported without blocking valid approvals."""
+        session_id = self._pending_session(session_manager, sample_recipe, temp_dir, "planning")
+
+        result = await recipes_tool._approve_batch(
+            {
+                "approvals": [
+                    {"session_id": session_id, "stage_name": "planning"},
+                    {"session_id": session_id, "stage_name": "review"},
+                    {"session_id": "missing", "stage_name": "planning"},
+                ]
+            },
+            temp_dir,
+        )
+
+        assert not result.success
+        assert result.error["approved"] == [{"session_id": session_id, "stage_name": "planning"}]
+        errors = [entry["error"] for entry in result.error["failed"]]
+        assert errors == [
+            "Stage mismatch: pending approval is for 'planning', not 'review'",
+            "Session not found: missing",
+        ]
+
+    async def test_requires_approvals_list(self, recipes_tool: RecipesTool, temp_dir: Path):
+        """Missing approvals list should return an error."""
+        result = await recipes_tool._approve_batch({}, temp_dir)
+
+        assert not result.success
+        assert "approvals list is required" in result.error["message"]
+
+
+class TestApproveDeny:
+    """Tests for the approve and deny operations."""
+
+    async def test_approve_pending_stage(
+        self, recipes_tool: RecipesTool, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Approving the pending stage should record approval and keep it pending for resume."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        session_manager.set_pending_approval(session_id, temp_dir, "planning", "Approve?", 0, "deny")
+
+        result = await recipes_tool._approve_stage({"session_id": session_id, "stage_name": "planning"}, temp_dir)
+
+        assert result.success
+        assert session_manager.get_stage_approval_status(session_id, temp_dir, "planning") == ApprovalStatus.APPROVED
+
+    async def test_deny_clears_pending(
+        self, recipes_tool: RecipesTool, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Denying should record denial and clear the pending approval."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        session_manager.set_pending_approval(session_id, temp_dir, "planning", "Approve?", 0, "deny")
+
+        result = await recipes_tool._deny_stage(
+            {"session_id": session_id, "stage_name": "planning", "reason": "No"}, temp_dir
+        )
+
+        assert result.success
+        assert session_manager.get_pending_approval(session_id, temp_dir) is None
+        assert session_manager.get_stage_approval_status(session_id, temp_dir, "planning") == ApprovalStatus.DENIED
+
+    async def test_unknown_session(self, recipes_tool: RecipesTool, temp_dir: Path):
+        """Unknown session should return not-found error."""
+        result = await recipes_tool._approve_stage({"session_id": "missing", "stage_name": "planning"}, temp_dir)
+
+        assert not result.success
+        assert result.error == {"message": "Session not found: missing"}
+
+    async def test_stage_mismatch(
+        self, recipes_tool: RecipesTool, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Approving a stage other than the pending one should fail."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        session_manager.set_pending_approval(session_id, temp_dir, "planning", "Approve?", 0, "deny")
+
+        result = await recipes_tool._deny_stage({"session_id": session_id, "stage_name": "review"}, temp_dir)
+
+        assert not result.success
+        assert "Stage mismatch" in result.error["message"]
+
+
+class TestContextOutput:
+    """Tests for inline vs spilled final context."""
+
+    def test_small_context_inline(self, recipes_tool: RecipesTool, sample_recipe: Recipe, temp_dir: Path):
+        """Contexts under the limit should be returned inline."""
+        session_id = recipes_tool.session_manager.create_session(sample_recipe, temp_dir)
+        context = {"result": "ok"}
+
+        assert recipes_tool._context_output(context, session_id, temp_dir) == {"context": context}
+
+    def test_large_context_written_to_session(self, recipes_tool: RecipesTool, sample_recipe: Recipe, temp_dir: Path):
+        """Contexts over the limit should be written to context.json and referenced."""
+        recipes_tool.config["max_inline_context_bytes"] = 10
+        session_id = recipes_tool.session_manager.create_session(sample_recipe, temp_dir)
+        context = {"result": "x" * 100, "other": 1}
+
+        output = recipes_tool._context_output(context, session_id, temp_dir)
+
+        assert "context" not in output
+        assert output["context_summary"]["keys"] == ["other", "result"]
+        context_file = Path(output["context_ref"])
+        assert context_file.name == "context.json"
+        assert json.loads(context_file.read_text()) == context
+        assert output["context_summary"]["size_bytes"] == context_file.stat().st_size
+
+    def test_spill_failure_returns_context_inline(
+        self, recipes_tool: RecipesTool, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """A failed context.json write should not turn a completed recipe into an error."""
+        recipes_tool.config["max_inline_context_bytes"] = 10
+        session_id = recipes_tool.session_manager.create_session(sample_recipe, temp_dir)
+        context = {"result": "x" * 100}
+
+        with patch.object(recipes_tool.session_manager, "save_context", side_effect=OSError("disk full")):
+            output = recipes_tool._context_output(context, session_id, temp_dir)
+
+        assert output["context"] == context
+        assert "disk full" in output["context_warning"]
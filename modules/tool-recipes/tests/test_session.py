@@ -2,14 +2,106 @@
 
 import datetime
 import json
+import math
+import os
 import re
+import uuid
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
+from amplifier_module_tool_recipes import session as session_module
 from amplifier_module_tool_recipes.models import Recipe
 from amplifier_module_tool_recipes.models import Step
+from amplifier_module_tool_recipes.session import ApprovalStatus
 from amplifier_module_tool_recipes.session import SessionManager
+from amplifier_module_tool_recipes.session import dumps_json
 from amplifier_module_tool_recipes.session import generate_session_id
 from amplifier_module_tool_recipes.session import get_project_slug
+from amplifier_module_tool_recipes.session import loads_json
+
+
+@dataclass
+class _Point:
+    x: int
+    y: int
+
+
+class _Mode(Enum):
+    FAST = "fast"
+
+
+class _Tag(str):
+    pass
+
+
+class TestDumpsJson:
+    """Tests for JSON serialization helper, with and without orjson installed."""
+
+    @pytest.fixture(autouse=True, params=["orjson", "stdlib"])
+    def encoder(self, request, monkeypatch):
+        """Run every test against both encoder paths."""
+        if request.param == "orjson" and session_module.orjson is None:
+            pytest.skip("orjson not installed")
+        if request.param == "stdlib":
+            monkeypatch.setattr(session_module, "orjson", None)
+        return request.param
+
+    def test_round_trips_plain_data(self):
+        """Plain JSON data should round-trip."""
+        data = {"name": "test", "items": [1, 2.5, None, True], "nested": {"key": "välue"}}
+        assert json.loads(dumps_json(data)) == data
+
+    def test_non_string_keys(self):
+        """Non-string keys are stringified, as the stdlib encoder does."""
+        assert json.loads(dumps_json({1: "one"})) == {"1": "one"}
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            Path("/tmp/file"),
+            datetime.date(2024, 1, 1),
+            datetime.datetime(2024, 1, 1, 12, 0),
+            _Point(1, 2),
+        ],
+        ids=["path", "date", "datetime", "dataclass"],
+    )
+    def test_unserializable_value_raises(self, value):
+        """Values JSON cannot represent fail loudly instead of being stringified."""
+        with pytest.raises(TypeError):
+            dumps_json({"value": value})
+
+    def test_uuid_and_enum_encode_as_values(self):
+        """UUIDs and enums encode the same way with either encoder."""
+        value = uuid.UUID("12345678-1234-5678-1234-567812345678")
+        data = {"id": value, "status": ApprovalStatus.APPROVED, "mode": _Mode.FAST}
+        assert json.loads(dumps_json(data)) == {"id": str(value), "status": "approved", "mode": "fast"}
+
+    def test_str_subclass_encodes_as_string(self):
+        """Subclasses of builtin types encode as their base type."""
+        assert json.loads(dumps_json({_Tag("k"): _Tag("v")})) == {"k": "v"}
+
+    def test_non_finite_floats_round_trip(self):
+        """NaN and Infinity are written as the stdlib encoder writes them, not as null."""
+        loaded = loads_json(dumps_json({"ratio": float("nan"), "limit": float("inf"), "none": None}))
+        assert math.isnan(loaded["ratio"])
+        assert loaded["limit"] == float("inf")
+        assert loaded["none"] is None
+
+    def test_large_integers(self):
+        """Integers beyond 64 bits should still serialize."""
+        assert json.loads(dumps_json({"big": 2**70})) == {"big": 2**70}
+
+    def test_indent(self):
+        """indent=True should produce two-space indented output."""
+        assert dumps_json({"a": [1]}, indent=True).decode("utf-8") == '{\n  "a": [\n    1\n  ]\n}'
+
+    def test_loads_round_trip(self):
+        """loads_json should parse what dumps_json produces."""
+        data = {"name": "tëst", "items": [1, None, True]}
+        assert loads_json(dumps_json(data)) == data
 
 
 class TestGenerateSessionId:
@@ -120,6 +212,18 @@ class TestSessionManager:
         assert loaded["completed_steps"] == ["step-1"]
         assert loaded["context"]["test"] == "value"
 
+    def test_save_state_replaces_file_atomically(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """save_state should leave only the final state.json behind."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        session_dir = session_manager.get_session_dir(session_id, temp_dir)
+
+        session_manager.save_state(session_id, temp_dir, {"session_id": session_id, "context": {"k": "v"}})
+
+        assert not (session_dir / "state.json.tmp").exists()
+        assert json.loads((session_dir / "state.json").read_text())["context"] == {"k": "v"}
+
     def test_load_state_not_found(self, session_manager: SessionManager, temp_dir: Path):
         """load_state should raise FileNotFoundError for nonexistent session."""
         import pytest
@@ -157,6 +261,18 @@ class TestSessionManager:
         recipe_names = {s["recipe_name"] for s in sessions}
         assert recipe_names == {"recipe-1", "recipe-2"}
 
+    def test_list_sessions_ignores_stray_entries(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """Files and directories without state.json in the sessions dir are skipped."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        sessions_dir = session_manager.get_sessions_dir(temp_dir)
+        (sessions_dir / "notes.txt").write_text("not a session")
+        (sessions_dir / "empty-dir").mkdir()
+
+        assert [s["session_id"] for s in session_manager.list_sessions(temp_dir)] == [session_id]
+        assert session_manager.cleanup_old_sessions(temp_dir) == 0
+
     def test_list_sessions_sorted_by_time(self, session_manager: SessionManager, temp_dir: Path):
         """list_sessions should return sessions sorted by time (newest first)."""
         import time
@@ -212,6 +328,36 @@ class TestSessionManager:
         # Session should no longer exist
         assert not session_manager.session_exists(session_id, temp_dir)
 
+    def test_cleanup_old_state_file_skips_parse(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """A state.json last written before the cutoff marks the session old without reading it."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        state_file = session_manager.get_session_dir(session_id, temp_dir) / "state.json"
+        old = (datetime.datetime.now() - datetime.timedelta(days=10)).timestamp()
+        os.utime(state_file, (old, old))
+
+        with patch("amplifier_module_tool_recipes.session.loads_json") as loads:
+            assert session_manager.cleanup_old_sessions(temp_dir) == 1
+
+        loads.assert_not_called()
+        assert not session_manager.session_exists(session_id, temp_dir)
+
+    def test_cleanup_old_session_id_skips_file_access(
+        self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path
+    ):
+        """A session ID timestamped before the cutoff is deleted from its name alone."""
+        session_id = session_manager.create_session(sample_recipe, temp_dir)
+        sessions_dir = session_manager.get_sessions_dir(temp_dir)
+        old_id = "0123456789abcdef-20000101-000000_recipe"
+        (sessions_dir / session_id).rename(sessions_dir / old_id)
+
+        with patch("amplifier_module_tool_recipes.session.loads_json") as loads:
+            assert session_manager.cleanup_old_sessions(temp_dir) == 1
+
+        loads.assert_not_called()
+        assert not session_manager.session_exists(old_id, temp_dir)
+
     def test_cleanup_keeps_recent_sessions(self, session_manager: SessionManager, temp_dir: Path):
         """cleanup_old_sessions should keep sessions within threshold."""
         recipe = Recipe(
@@ -233,6 +379,15 @@ class TestSessionManager:
         sessions_dir = session_manager.get_sessions_dir(temp_dir)
         assert "recipe-sessions" in str(sessions_dir)
 
+    def test_get_sessions_dir_resolves_once(self, session_manager: SessionManager, temp_dir: Path):
+        """Absolute project paths should be resolved to a slug only once."""
+        with patch("amplifier_module_tool_recipes.session.get_project_slug", wraps=get_project_slug) as slug:
+            first = session_manager.get_sessions_dir(temp_dir)
+            second = session_manager.get_sessions_dir(temp_dir)
+
+        assert first == second
+        assert slug.call_count == 1
+
     def test_get_session_dir(self, session_manager: SessionManager, sample_recipe: Recipe, temp_dir: Path):
         """get_session_dir should return correct path for session."""
         session_id = session_manager.create_session(sample_recipe, temp_dir)
@@ -42,6 +42,13 @@ class TestExtractVariables:
         variables = extract_variables("{{first_result}} and {{second_result}}")
         assert variables == {"first_result", "second_result"}
 
+    def test_extract_reuses_result_for_same_template(self):
+        """Repeated templates should return the cached, immutable result."""
+        template = "{{shared}} snippet {{other.field}}"
+        first = extract_variables(template)
+        assert extract_variables(template) is first
+        assert isinstance(first, frozenset)
+
 
 class TestCheckVariableReferences:
     """Tests for check_variable_references function."""
@@ -212,6 +219,20 @@ class TestCheckStepDependencies:
         errors = check_step_dependencies(recipe)
         assert any("later" in e.lower() for e in errors)
 
+    def test_dependency_uses_first_matching_step(self):
+        """With duplicate IDs, ordering is checked against the first occurrence."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(id="s1", agent="a", prompt="First"),
+                Step(id="s2", agent="b", prompt="Second", depends_on=["s1"]),
+                Step(id="s1", agent="c", prompt="Duplicate"),
+            ],
+        )
+        assert check_step_dependencies(recipe) == []
+
     def test_self_dependency(self):
         """Self-dependency should produce error."""
         recipe = Recipe(
@@ -271,6 +292,21 @@ class TestValidateRecipe:
         result = validate_recipe(multi_step_recipe)
         assert result.is_valid
 
+    def test_dependency_cycle_reported_once(self):
+        """A multi-step cycle is reported once across structural and dependency checks."""
+        recipe = Recipe(
+            name="test",
+            description="test",
+            version="1.0.0",
+            steps=[
+                Step(id="a", agent="x", prompt="p", depends_on=["b"]),
+                Step(id="b", agent="x", prompt="p", depends_on=["a"]),
+            ],
+        )
+        result = validate_recipe(recipe)
+        assert not result.is_valid
+        assert [e for e in result.errors if "Circular" in e] == ["Circular dependency between steps: a, b"]
+
 
 class TestValidationResult:
     """Tests for ValidationResult dataclass."""